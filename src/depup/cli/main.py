@@ -1,44 +1,37 @@
 from __future__ import annotations
 
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
 from pathlib import Path
 from typing import List, Optional, Set
 
 import typer
-from rich.console import Console
-from rich.table import Table
+from packaging.utils import canonicalize_name
 
+from depup.utils.console import get_console
 from depup.utils.logging_config import configure_logging
 
 from depup.core.parsers.declaration_parser import DependencyParser
 from depup.core.parsers.poetry_lock_parser import PoetryLockParser
 from depup.core.parsers.pipfile_lock_parser import PipfileLockParser
 
-from depup.core.environment_scanner import EnvironmentScanner
-from depup.core.version_scanner import VersionScanner, VersionScannerError
-from depup.core.upgrade_executor import UpgradeExecutor, PlannedUpgrade
-from depup.core.models import VersionInfo, UpdateType
-
-from depup.utils.render import (
-    render_env_upgrade_table,
-    render_file_upgrade_table,
-    render_upgrade_summary,
-    render_latest_env_table,
-    render_env_table,
-    render_latest_file_table,
-    render_declared_file_table,
-)
-
-from depup.utils.upgrade_planner import build_upgrade_plans
+from depup.core.cache import PyPICache, default_cache_dir
+from depup.core.models import DependencySpec, VersionInfo
 
-from depup.utils.scan_utils import _has_outdated, _convert_to_jsonable
+from depup.utils.scan_utils import (
+    _convert_to_jsonable,
+    _has_outdated,
+    _index_by_key,
+    _write_json,
+)
 from depup.utils.upgrade_utils import (
     _perform_env_upgrades,
     select_upgradable_versions
 )
-from depup.utils.report_utils import generate_markdown_report
 
 app = typer.Typer(help="Dependency Upgrade Advisor CLI")
-console = Console()
 
 
 # ---------------------------------------------------------------------
@@ -86,50 +79,78 @@ def scan_command(
         "--check",
         help="Exit with non-zero status if outdated dependencies are found.",
     ),
+    outdated_only: bool = typer.Option(
+        False,
+        "--outdated-only",
+        help="With --latest, list only packages that have an update.",
+    ),
     report: Optional[Path] = typer.Option(
         None,
         "--report",
         help="Write scan results to a Markdown report file.",
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Bypass all depup caches (PyPI metadata and installed-environment scans).",
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Revalidate every cached PyPI entry, ignoring the freshness window.",
+    ),
 ) -> None:
     """
     Scan dependency files or installed environment for outdated dependencies.
     """
 
     if check and not latest:
-        console.print("[red]--check requires --latest[/red]")
+        get_console().print("[red]--check requires --latest[/red]")
+        raise typer.Exit(2)
+
+    if outdated_only and not latest:
+        get_console().print("[red]--outdated-only requires --latest[/red]")
         raise typer.Exit(2)
 
     # =========================================================
     # ENVIRONMENT MODE
     # =========================================================
     if env:
-        console.print("[blue]Scanning installed environment packages...[/blue]")
+        get_console().print("[blue]Scanning installed environment packages...[/blue]")
 
-        deps = EnvironmentScanner().scan()
+        deps = _scan_environment(use_cache=not no_cache)
 
         if not deps:
-            console.print("[yellow]No installed packages detected.[/yellow]")
+            get_console().print("[yellow]No installed packages detected.[/yellow]")
             raise typer.Exit(0)
 
-        infos = _scan_versions(deps, latest)
+        infos = _scan_versions(
+            deps,
+            latest,
+            use_cache=not no_cache,
+            refresh=refresh,
+        )
+        info_by_key = _index_by_key(infos) if latest else {}
 
         _render_scan_output(
             deps=deps,
-            infos=infos,
+            info_by_key=info_by_key,
             latest=latest,
             json_output=json_output,
             env=True,
+            outdated_only=outdated_only,
         )
 
         if report:
+            from depup.utils.report_utils import generate_markdown_report
+
             generate_markdown_report(
                 output_path=report,
                 deps=deps,
-                infos=infos,
+                info_by_key=info_by_key,
                 title="Environment Dependency Report",
             )
-            console.print(f"[green]Markdown report written to {report}[/green]")
+            get_console().print(f"[green]Markdown report written to {report}[/green]")
 
         _exit_check_mode(infos, check)
 
@@ -138,12 +159,10 @@ def scan_command(
     # =========================================================
     project_root = path or Path.cwd()
 
-    deps = DependencyParser(project_root).parse_all()
-    deps.extend(PoetryLockParser(project_root).parse())
-    deps.extend(PipfileLockParser(project_root).parse())
+    deps = _parse_project(project_root)
 
     if not deps:
-        console.print(
+        get_console().print(
             "[yellow]No dependency files found.[/yellow]\n"
             "Try:\n"
             "  • depup scan --env\n"
@@ -151,24 +170,33 @@ def scan_command(
         )
         raise typer.Exit(0)
 
-    infos = _scan_versions(deps, latest)
+    infos = _scan_versions(
+        deps,
+        latest,
+        use_cache=not no_cache,
+        refresh=refresh,
+    )
+    info_by_key = _index_by_key(infos) if latest else {}
 
     _render_scan_output(
         deps=deps,
-        infos=infos,
+        info_by_key=info_by_key,
         latest=latest,
         json_output=json_output,
         env=False,
+        outdated_only=outdated_only,
     )
 
     if report:
+        from depup.utils.report_utils import generate_markdown_report
+
         generate_markdown_report(
             output_path=report,
             deps=deps,
-            infos=infos,
+            info_by_key=info_by_key,
             title="Project Dependency Report",
         )
-        console.print(f"[green]Markdown report written to {report}[/green]")
+        get_console().print(f"[green]Markdown report written to {report}[/green]")
 
     _exit_check_mode(infos, check)
 
@@ -227,19 +255,42 @@ def upgrade_command(
             "instead of project dependency files."
         ),
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Bypass all depup caches (PyPI metadata and installed-environment scans).",
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Revalidate every cached PyPI entry, ignoring the freshness window.",
+    ),
 ) -> None:
     """
     Upgrade outdated dependencies.
     """
+    from depup.utils.render import (
+        render_env_upgrade_table,
+        render_file_upgrade_table,
+        render_upgrade_summary,
+    )
 
-    pkg_filter: Optional[Set[str]] = {p.lower() for p in packages} if packages else None
+    pkg_filter: Optional[Set[str]] = (
+        {canonicalize_name(p) for p in packages} if packages else None
+    )
 
     # =========================================================
     # ENVIRONMENT MODE
     # =========================================================
     if env:
-        deps = EnvironmentScanner().scan()
-        infos = VersionScanner().scan(deps)
+        deps = _scan_environment(use_cache=not no_cache)
+        infos = _scan_versions(
+            deps,
+            latest=True,
+            use_cache=not no_cache,
+            refresh=refresh,
+            only=pkg_filter,
+        )
 
         selected = select_upgradable_versions(
             infos,
@@ -250,7 +301,9 @@ def upgrade_command(
         )
 
         if not selected:
-            console.print("[green]All environment packages are up to date![/green]")
+            get_console().print(
+                "[green]All environment packages are up to date![/green]"
+            )
             raise typer.Exit(0)
 
         render_env_upgrade_table(selected)
@@ -267,7 +320,13 @@ def upgrade_command(
     project_root = path or Path.cwd()
     deps = DependencyParser(project_root).parse_all()
 
-    infos = VersionScanner().scan(deps)
+    infos = _scan_versions(
+        deps,
+        latest=True,
+        use_cache=not no_cache,
+        refresh=refresh,
+        only=pkg_filter,
+    )
 
     selected = select_upgradable_versions(
         infos,
@@ -278,9 +337,12 @@ def upgrade_command(
     )
 
     if not selected:
-        console.print("[green]No matching upgrades found.[/green]")
+        get_console().print("[green]No matching upgrades found.[/green]")
         raise typer.Exit(0)
 
+    from depup.core.upgrade_executor import UpgradeExecutor
+    from depup.utils.upgrade_planner import build_upgrade_plans
+
     plans = build_upgrade_plans(selected, deps, project_root)
     render_file_upgrade_table(plans, selected, dry_run)
 
@@ -294,33 +356,103 @@ def upgrade_command(
 # ---------------------------------------------------------------------
 # INTERNAL HELPERS (CLI-SAFE)
 # ---------------------------------------------------------------------
-def _scan_versions(deps, latest: bool) -> List[VersionInfo]:
+def _parse_project(project_root: Path) -> List[DependencySpec]:
+    """
+    Parse declaration files and lockfiles concurrently.
+
+    A lockfile's pins are authoritative, so the declaration file it was
+    generated from (pyproject.toml for poetry.lock, Pipfile for Pipfile.lock)
+    is not parsed when the lockfile is present.
+
+    The three parsers are independent file reads + TOML/JSON decodes, so they
+    overlap on a small thread pool. Results keep the declaration, Poetry,
+    Pipfile order.
+    """
+    poetry_lock = PoetryLockParser(project_root)
+    pipfile_lock = PipfileLockParser(project_root)
+
+    superseded = set()
+    if poetry_lock.exists():
+        superseded.add("pyproject.toml")
+    if pipfile_lock.exists():
+        superseded.add("Pipfile")
+
+    parsers = (
+        partial(DependencyParser(project_root).parse_all, exclude=superseded),
+        poetry_lock.parse,
+        pipfile_lock.parse,
+    )
+    with ThreadPoolExecutor(max_workers=len(parsers)) as executor:
+        futures = [executor.submit(parse) for parse in parsers]
+        return list(chain.from_iterable(f.result() for f in futures))
+
+
+def _scan_environment(use_cache: bool = True) -> List[DependencySpec]:
+    # Deferred: importlib.metadata is only needed for --env.
+    from depup.core.environment_scanner import EnvironmentScanner
+
+    cache_dir = default_cache_dir() if use_cache else None
+    return EnvironmentScanner(cache_dir=cache_dir).scan()
+
+
+def _scan_versions(
+    deps,
+    latest: bool,
+    use_cache: bool = True,
+    refresh: bool = False,
+    only: Optional[Set[str]] = None,
+) -> List[VersionInfo]:
     if not latest:
-        return [
-            VersionInfo(
-                name=d.name,
-                current=d.version,
-                latest=d.version,
-                update_type=UpdateType.NONE,
-            )
-            for d in deps
-        ]
+        # Nothing was looked up; renderers treat missing entries as unknown.
+        return []
+
+    # Deferred: the PyPI client pulls in requests/urllib3/ssl, which only
+    # --latest and upgrade need.
+    from depup.core.version_scanner import VersionScanner, VersionScannerError
+
     try:
-        return VersionScanner().scan(deps)
+        cache = None
+        if use_cache:
+            cache = PyPICache(max_age=0) if refresh else PyPICache()
+        return VersionScanner(cache=cache).scan(deps, only=only)
     except VersionScannerError as exc:
-        console.print(f"[red]Failed to scan versions: {exc}[/red]")
+        get_console().print(f"[red]Failed to scan versions: {exc}[/red]")
         raise typer.Exit(1)
 
 
-def _render_scan_output(*, deps, infos, latest, json_output, env: bool) -> None:
+def _render_scan_output(
+    *,
+    deps,
+    info_by_key,
+    latest,
+    json_output,
+    env: bool,
+    outdated_only: bool = False,
+) -> None:
     if json_output:
-        console.print_json(data=_convert_to_jsonable(deps, infos))
+        if sys.stdout.isatty():
+            get_console().print_json(data=_convert_to_jsonable(deps, info_by_key))
+        else:
+            # Piped output is for machines: skip Rich's re-parse, highlighting
+            # and reflow and stream compact JSON directly.
+            _write_json(sys.stdout, deps, info_by_key)
         return
 
-    if env:
-        render_latest_env_table(deps, infos) if latest else render_env_table(deps)
+    # Deferred with the other renderers: rich.table is only needed for
+    # table output, and --help never gets here.
+    from depup.utils.render import (
+        render_declared_file_table,
+        render_env_table,
+        render_latest_env_table,
+        render_latest_file_table,
+    )
+
+    if not latest:
+        render_env_table(deps) if env else render_declared_file_table(deps)
+    elif env:
+        render_latest_env_table(deps, info_by_key, outdated_only=outdated_only)
     else:
-        render_latest_file_table(deps, infos) if latest else render_declared_file_table(deps)
+        render_latest_file_table(deps, info_by_key, outdated_only=outdated_only)
 
 
 def _exit_check_mode(infos: List[VersionInfo], check: bool) -> None:
@@ -0,0 +1,141 @@
+"""
+On-disk caches for depup.
+
+PyPI lookups: a single JSON index maps each package to the latest version
+PyPI reported for it, together with the response validators (ETag /
+Last-Modified). Repeat scans send these back as a conditional GET, so an
+unchanged package costs a bodyless 304 instead of a full metadata download
+and JSON parse. Entries revalidated within the freshness window skip the
+network entirely. The index is read once per scan and written back once.
+
+Installed environments: see EnvironmentScanner, which stores its package list
+here keyed by interpreter and invalidated by site directory mtimes.
+
+Caches are strictly best-effort: unreadable or unwritable entries are treated
+as misses and never fail a scan.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the root cache directory for depup (``$XDG_CACHE_HOME/depup``).
+    """
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "depup"
+
+
+def read_json(path: Path) -> Optional[Any]:
+    """
+    Load a cached JSON document, returning None when missing or unreadable.
+    """
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.debug("Ignoring unreadable cache file %s: %s", path, exc)
+        return None
+
+
+def write_json(path: Path, data: Any) -> None:
+    """
+    Atomically replace a cached JSON document; failures are only logged.
+    """
+    tmp = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(path)
+    except OSError as exc:
+        logger.debug("Could not write cache file %s: %s", path, exc)
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """
+    Cached PyPI lookup for a single package.
+    """
+    latest: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float = 0.0
+
+
+class PyPICache:
+    """
+    Single-index store for PyPI lookups, keyed by package name.
+
+    Entries younger than `max_age` seconds are trusted without contacting
+    PyPI at all; older ones are revalidated with a conditional GET.
+
+    The index is loaded on first access and kept in memory; `set()` only
+    updates that copy and `flush()` writes it back in one go. Access is
+    thread-safe so scanner workers can share one instance.
+    """
+
+    DEFAULT_MAX_AGE = 600
+    INDEX_NAME = "index.json"
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        self.cache_dir = cache_dir or default_cache_dir() / "pypi"
+        self.max_age = max_age
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def get(self, package: str) -> Optional[CacheEntry]:
+        with self._lock:
+            data = self._load().get(package.lower())
+        if not isinstance(data, dict) or "latest" not in data:
+            return None
+        return CacheEntry(
+            latest=data["latest"],
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            fetched_at=data.get("fetched_at", 0.0),
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.max_age
+
+    def set(self, package: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._load()[package.lower()] = asdict(entry)
+            self._dirty = True
+
+    def flush(self) -> None:
+        """
+        Write the index back to disk if any entry changed since loading.
+        """
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            write_json(self._index_path(), self._entries)
+            self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        # Caller holds self._lock.
+        if self._entries is None:
+            data = read_json(self._index_path())
+            self._entries = data if isinstance(data, dict) else {}
+        return self._entries
+
+    def _index_path(self) -> Path:
+        return self.cache_dir / self.INDEX_NAME
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import stat
+import sys
 from importlib import metadata
-from typing import List
+from pathlib import Path
+from typing import List, Optional
 
+from depup.core.cache import read_json, write_json
 from depup.core.models import DependencySpec
 
 logger = logging.getLogger(__name__)
@@ -22,9 +28,63 @@ class EnvironmentScanner:
       - venv
       - poetry
       - system python
+
+    When a cache directory is given, the package list is stored there and
+    reused until a sys.path directory changes (installing, upgrading or
+    removing a distribution adds/removes its *.dist-info entry, which bumps
+    the directory mtime) or the search path itself changes.
     """
 
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        self.cache_dir = cache_dir
+
     def scan(self) -> List[DependencySpec]:
+        if self.cache_dir is None:
+            return self._scan_distributions()
+
+        cache_path, fingerprint = self._cache_key(self.cache_dir)
+        cached = read_json(cache_path)
+        if isinstance(cached, dict) and cached.get("fingerprint") == fingerprint:
+            logger.debug("Using cached environment scan %s", cache_path)
+            return [
+                DependencySpec(name=name, version=version, source_file=None)
+                for name, version in cached.get("packages", [])
+            ]
+
+        deps = self._scan_distributions()
+        write_json(
+            cache_path,
+            {
+                "fingerprint": fingerprint,
+                "packages": [[d.name, d.version] for d in deps],
+            },
+        )
+        return deps
+
+    def _cache_key(self, cache_dir: Path) -> tuple[Path, List[List[object]]]:
+        """
+        Return the cache file for this interpreter and search path, and the
+        mtime fingerprint that must match for the cached list to be valid.
+        """
+        # importlib.metadata finds distributions in every sys.path directory
+        # (site-packages, PYTHONPATH entries, `pip install --target` dirs), so
+        # all of them take part in both the cache identity and the
+        # fingerprint.
+        fingerprint: List[List[object]] = []
+        for entry in sys.path:
+            try:
+                st = os.stat(entry or ".")
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                fingerprint.append([entry, st.st_mtime_ns])
+
+        env_id = hashlib.sha256(
+            "\0".join([sys.prefix, *sys.path]).encode("utf-8")
+        ).hexdigest()[:16]
+        return cache_dir / f"env-{env_id}.json", fingerprint
+
+    def _scan_distributions(self) -> List[DependencySpec]:
         try:
             dists = metadata.distributions()
         except Exception as exc:
@@ -37,8 +97,11 @@ class EnvironmentScanner:
         deps: List[DependencySpec] = []
         for dist in dists:
             try:
-                name = dist.metadata.get("Name") or ""
-                version = dist.version
+                # Distribution.metadata re-reads and parses METADATA on every
+                # access (dist.version included), so read it exactly once.
+                meta = dist.metadata
+                name = meta["Name"] or ""
+                version = meta["Version"]
             except Exception:
                 continue
 
@@ -47,7 +110,7 @@ class EnvironmentScanner:
 
             deps.append(
                 DependencySpec(
-                    name=name.lower(),
+                    name=name,
                     version=version,
                     source_file=None,
                 )
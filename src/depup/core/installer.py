@@ -0,0 +1,52 @@
+"""
+Installer selection shared by file-based and environment upgrades.
+
+`uv pip install` is used when uv is on PATH (a much faster resolver, and it
+works in uv-created venvs that have no pip); pip is used otherwise. uv does
+not read pip's configuration (pip.conf, PIP_INDEX_URL, ...), so the choice
+can be pinned with the DEPUP_INSTALLER environment variable:
+
+    DEPUP_INSTALLER=pip   always use `python -m pip`
+    DEPUP_INSTALLER=uv    use uv (falls back to pip if it is not on PATH)
+    DEPUP_INSTALLER=auto  the default described above
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import sys
+from typing import Iterable, List
+
+logger = logging.getLogger(__name__)
+
+INSTALLER_ENV = "DEPUP_INSTALLER"
+_CHOICES = ("auto", "pip", "uv")
+
+
+def install_command(specs: Iterable[str]) -> List[str]:
+    """
+    Build the command that installs/upgrades `specs` into the environment
+    of the running interpreter.
+    """
+    choice = os.environ.get(INSTALLER_ENV, "auto").strip().lower() or "auto"
+    if choice not in _CHOICES:
+        logger.warning(
+            "Ignoring %s=%s (expected one of %s)",
+            INSTALLER_ENV,
+            choice,
+            ", ".join(_CHOICES),
+        )
+        choice = "auto"
+
+    uv = shutil.which("uv") if choice != "pip" else None
+    if choice == "uv" and uv is None:
+        logger.warning("%s=uv but uv is not on PATH; using pip", INSTALLER_ENV)
+
+    if uv:
+        # --python pins uv to this interpreter rather than any active venv.
+        return [
+            uv, "pip", "install", "--python", sys.executable, "--upgrade", *specs
+        ]
+    return [sys.executable, "-m", "pip", "install", "--upgrade", *specs]
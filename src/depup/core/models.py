@@ -1,9 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+
+from packaging.utils import canonicalize_name
+
+
+@lru_cache(maxsize=None)
+def name_key(name: str) -> str:
+    """
+    PEP 503 normalized, interned form of a distribution name.
+    """
+    return sys.intern(canonicalize_name(name))
 
 
 class UpdateType(str, Enum):
@@ -13,22 +25,68 @@ class UpdateType(str, Enum):
     MAJOR = "major"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DependencySpec:
     """
     Represents a declared or locked dependency.
+
+    `canonical_name` is the PEP 503 normalized name (lowercased, runs of
+    "-", "_" and "." folded to "-"), derived at construction and used as the
+    join key together with the declared spec (`join_key`); `name` keeps the
+    spelling from the source file.
+    `source_file_name` is the interned base name of `source_file` ("" when
+    there is none), shared by every dependency from the same file.
     """
     name: str
     version: Optional[str]
     source_file: Optional[Path]
+    canonical_name: str = field(init=False, repr=False, compare=False)
+    source_file_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "canonical_name", name_key(self.name))
+        object.__setattr__(
+            self,
+            "source_file_name",
+            sys.intern(self.source_file.name) if self.source_file else "",
+        )
 
+    @property
+    def join_key(self) -> Tuple[str, str]:
+        return self.canonical_name, self.version or ""
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class VersionInfo:
     """
     Represents version resolution information for a dependency.
+
+    `canonical_name` is the PEP 503 normalized name, derived at construction;
+    together with the declared spec `current` it forms the join key.
     """
     name: str
     current: Optional[str]
     latest: Optional[str]
     update_type: UpdateType
+    canonical_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "canonical_name", name_key(self.name))
+
+    @property
+    def join_key(self) -> Tuple[str, str]:
+        """
+        Matches `DependencySpec.join_key` of the dependency it was resolved
+        for, so a package pinned differently in two files keeps both results.
+        """
+        return self.canonical_name, self.current or ""
+
+
+# Stand-in for a package without a lookup result, so joins can read its
+# fields unconditionally: `info_by_key.get(key, EMPTY_INFO)`.
+EMPTY_INFO = VersionInfo(
+    name="",
+    current=None,
+    latest=None,
+    update_type=UpdateType.NONE,
+)
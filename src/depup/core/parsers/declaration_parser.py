@@ -12,16 +12,36 @@ Normalizes all dependencies into DependencySpec.
 from __future__ import annotations
 
 import logging
+import mmap
+import os
 import re
-import tomllib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from depup.core.exceptions import InvalidDependencyFileError
 from depup.core.models import DependencySpec
+from depup.core.parsers.toml_loader import load_toml
 
 logger = logging.getLogger(__name__)
 
+# One anchored, multiline pattern scanned over the whole (memory-mapped) file:
+# a name, an optional specifier and an optional trailing comment per line.
+# Blank lines, comment lines and anything unsupported (-r, -e, --pre, local
+# paths such as "." or "..", URLs, extras) fall between matches: a name must
+# start with a letter or digit. Bytes-level, so CRLF line endings are
+# tolerated here.
+_REQUIREMENT_LINE = re.compile(
+    rb"^[ \t]*([A-Za-z0-9][A-Za-z0-9_.\-]*)"
+    rb"[ \t]*([<>=!~][^\r\n#]*?)?[ \t\r]*(?:#.*)?$",
+    re.MULTILINE,
+)
+# PEP 508 string: name, optional [extras], specifier, optional ; marker.
+# Extras and markers are matched so they never leak into name or version.
+_PEP621_DEPENDENCY = re.compile(
+    r"^([A-Za-z0-9][A-Za-z0-9._\-]*)\s*(?:\[[^\]]*\])?\s*([^;]*?)\s*(?:;.*)?$"
+)
+
 
 class DependencyParser:
     """
@@ -37,9 +57,12 @@ class DependencyParser:
     def __init__(self, project_root: Path) -> None:
         self.project_root = project_root
 
-    def parse_all(self) -> List[DependencySpec]:
+    def parse_all(self, exclude: Iterable[str] = ()) -> List[DependencySpec]:
         """
         Parse all supported dependency files found in the project root.
+
+        Args:
+            exclude: File names to leave unparsed even if present.
         """
         results: List[DependencySpec] = []
 
@@ -48,12 +71,29 @@ class DependencyParser:
             self.project_root,
         )
 
-        for file_name in self.SUPPORTED_FILES:
-            file_path = self.project_root / file_name
-            if not file_path.exists():
-                continue
-
-            parsed = self._parse_file(file_path)
+        # One directory listing instead of a stat() per supported file name.
+        try:
+            with os.scandir(self.project_root) as entries:
+                present = {entry.name for entry in entries}
+        except OSError as exc:
+            logger.debug("Cannot list %s: %s", self.project_root, exc)
+            return results
+
+        paths = [
+            self.project_root / file_name
+            for file_name in self.SUPPORTED_FILES
+            if file_name in present and file_name not in exclude
+        ]
+
+        # Files are independent, so overlap their reads and parses. map()
+        # keeps SUPPORTED_FILES order and re-raises the first parser error.
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+                parsed_files = list(executor.map(self._parse_file, paths))
+        else:
+            parsed_files = [self._parse_file(path) for path in paths]
+
+        for file_path, parsed in zip(paths, parsed_files):
             if parsed is None:
                 raise InvalidDependencyFileError(
                     f"Parser for {file_path} returned no data."
@@ -83,36 +123,49 @@ class DependencyParser:
     # ------------------------------------------------------------------
     def _parse_requirements(self, path: Path) -> List[DependencySpec]:
         deps: List[DependencySpec] = []
-        pattern = re.compile(r"^([a-zA-Z0-9_\-]+)\s*([<>=!~].+)?$")
-
-        for raw_line in path.read_text().splitlines():
-            line = raw_line.strip()
-
-            if not line or line.startswith("#"):
-                continue
-
-            match = pattern.match(line)
-            if not match:
-                logger.warning("Skipping unrecognized requirement line: %s", line)
-                continue
 
-            name, version = match.group(1), match.group(2)
-            deps.append(
-                DependencySpec(
-                    name=name.lower(),
-                    version=version,
-                    source_file=path,
+        # Scan the mapped file directly: no decoded copy of the whole file
+        # and no list of lines, only the matched names and specifiers.
+        with path.open("rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file, nothing to map
+                return deps
+
+        with mm:
+            pos = 0
+            for match in _REQUIREMENT_LINE.finditer(mm):
+                self._warn_unrecognized(mm[pos:match.start()])
+                pos = match.end()
+
+                name, version = match.group(1), match.group(2)
+                deps.append(
+                    DependencySpec(
+                        name=name.decode(),
+                        version=version.decode() if version else None,
+                        source_file=path,
+                    )
                 )
-            )
+            self._warn_unrecognized(mm[pos:])
 
         return deps
 
+    def _warn_unrecognized(self, gap: bytes) -> None:
+        """
+        Warn about requirement lines skipped between two regex matches.
+        """
+        if not gap.strip():
+            return
+        for raw_line in gap.decode("utf-8", "replace").splitlines():
+            line = raw_line.strip()
+            if line and not line.startswith("#"):
+                logger.warning("Skipping unrecognized requirement line: %s", line)
+
     # ------------------------------------------------------------------
     # pyproject.toml
     # ------------------------------------------------------------------
     def _parse_pyproject(self, path: Path) -> List[DependencySpec]:
-        with path.open("rb") as f:
-            data = tomllib.load(f)
+        data = load_toml(path)
 
         deps: List[DependencySpec] = []
 
@@ -123,7 +176,7 @@ class DependencyParser:
                 name, version = self._split_pep621_dependency(item)
                 deps.append(
                     DependencySpec(
-                        name=name.lower(),
+                        name=name,
                         version=version,
                         source_file=path,
                     )
@@ -142,7 +195,7 @@ class DependencyParser:
 
             deps.append(
                 DependencySpec(
-                    name=name.lower(),
+                    name=name,
                     version=str(version),
                     source_file=path,
                 )
@@ -159,10 +212,7 @@ class DependencyParser:
         """
         dep = dep.strip()
 
-        match = re.match(
-            r"^([a-zA-Z0-9_\-]+)\s*(.*)?$",
-            dep,
-        )
+        match = _PEP621_DEPENDENCY.match(dep)
         if not match:
             return dep, None
 
@@ -175,8 +225,7 @@ class DependencyParser:
     # Pipfile
     # ------------------------------------------------------------------
     def _parse_pipfile(self, path: Path) -> List[DependencySpec]:
-        with path.open("rb") as f:
-            data = tomllib.load(f)
+        data = load_toml(path)
 
         deps: List[DependencySpec] = []
 
@@ -185,7 +234,7 @@ class DependencyParser:
             for name, version in section.items():
                 deps.append(
                     DependencySpec(
-                        name=name.lower(),
+                        name=name,
                         version=str(version),
                         source_file=path,
                     )
@@ -6,6 +6,11 @@ from typing import List
 
 from depup.core.models import DependencySpec
 
+try:  # optional C parser, installed with the "fast" extra
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
 
 class PipfileLockParser:
     """Read-only parser for Pipfile.lock."""
@@ -23,8 +28,8 @@ class PipfileLockParser:
         if not self.exists():
             return []
 
-        with self.lockfile_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        raw = self.lockfile_path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
         deps: List[DependencySpec] = []
 
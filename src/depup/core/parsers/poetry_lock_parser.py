@@ -3,9 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
-import tomllib
-
 from depup.core.models import DependencySpec
+from depup.core.parsers.toml_loader import load_toml
 
 
 class PoetryLockParser:
@@ -24,8 +23,7 @@ class PoetryLockParser:
         if not self.exists():
             return []
 
-        with self.lockfile_path.open("rb") as f:
-            data = tomllib.load(f)
+        data = load_toml(self.lockfile_path)
 
         packages = data.get("package", [])
         deps: List[DependencySpec] = []
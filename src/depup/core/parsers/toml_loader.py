@@ -0,0 +1,29 @@
+"""
+TOML loading shared by the read-only parsers.
+
+Uses the Rust-backed `rtoml` when it is installed (the "fast" extra) and the
+stdlib `tomllib` otherwise. Both return plain dicts for the documents depup
+reads, so callers do not need to know which backend ran.
+"""
+
+from __future__ import annotations
+
+import tomllib
+from pathlib import Path
+from typing import Any, Dict, cast
+
+try:  # optional Rust parser, installed with the "fast" extra
+    import rtoml
+except ImportError:  # pragma: no cover - depends on the environment
+    rtoml = None
+
+
+def load_toml(path: Path) -> Dict[str, Any]:
+    """
+    Parse the TOML document at `path`.
+    """
+    if rtoml is not None:
+        return cast(Dict[str, Any], rtoml.load(path))
+
+    with path.open("rb") as f:
+        return tomllib.load(f)
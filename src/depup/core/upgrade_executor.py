@@ -3,7 +3,8 @@ Upgrade executor.
 
 Responsible for:
 - Taking a list of planned upgrades (packages and target versions).
-- Running `pip install --upgrade` for each package (unless dry-run).
+- Running one install (uv or pip, see depup.core.installer) for all packages
+  at once (unless dry-run).
 - Updating dependency declarations in:
   - requirements.txt
   - pyproject.toml (PEP 621 + Poetry)
@@ -12,30 +13,113 @@ Responsible for:
 This uses a minimal, safe strategy:
 - For requirements.txt: rewrite pinned/ranged versions on matching lines.
 - For pyproject.toml:
-    - [project].dependencies: rewrite only the version number, keep operator.
+    - [project].dependencies: rewrite only the version number, keep operator,
+      extras and markers; multi-clause specifiers are reported, not changed.
     - [tool.poetry.dependencies]: rewrite only the version number, keep operator.
 - For Pipfile:
     - [packages] / [dev-packages]: rewrite only non-wildcard version strings.
+
+TOML files are edited in place, so comments, quoting and ordering survive;
+only layouts the in-place edit cannot handle are re-serialized with tomli_w.
 """
 
 from __future__ import annotations
 
 import logging
 import re
-import sys
+import shutil
 import subprocess
-from dataclasses import dataclass
+import tomllib
+from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
-import tomllib
 import tomli_w
 
 from depup.core.exceptions import DepupError
-from depup.core.models import DependencySpec
+from depup.core.installer import install_command
+from depup.core.models import DependencySpec, name_key
 
 logger = logging.getLogger(__name__)
 
+# (table, key or None for an array element, old string value, new string value)
+_TomlEdit = Tuple[str, Optional[str], str, str]
+
+
+def _requirement_pins_for(names: Iterable[str]) -> re.Pattern[str]:
+    """
+    Match pinned/ranged requirements.txt lines for any of the given normalized
+    names: indent, name, operator, version and whatever follows (markers,
+    comments). Separators inside a name match any PEP 503 spelling.
+    """
+    alternation = "|".join(
+        "[-_.]+".join(re.escape(part) for part in name.split("-")) for name in names
+    )
+    return re.compile(
+        rf"^([ \t]*)({alternation})([ \t]*[<>=!~]+)([^;\s]+)(.*)$",
+        re.IGNORECASE | re.MULTILINE,
+    )
+
+
+_TOML_TABLE_HEADER = re.compile(r"^[ \t]*\[", re.MULTILINE)
+# PEP 508 string, split so only the specifier is ever rewritten: `head` is
+# the name plus optional [extras], `tail` the optional "; marker". Mirrors
+# the parser's _PEP621_DEPENDENCY.
+_PEP621_ENTRY = re.compile(
+    r"^(?P<head>\s*(?P<name>[A-Za-z0-9][A-Za-z0-9._\-]*)\s*(?:\[[^\]]*\])?\s*)"
+    r"(?P<spec>[^;]*?)(?P<tail>\s*(?:;.*)?)$",
+    re.DOTALL,
+)
+# A specifier with exactly one clause, e.g. ">=1.0" or "== 1.2.3".
+_SINGLE_SPECIFIER = re.compile(r"(?P<op>===|==|>=|<=|~=|!=|<|>)(?P<ws>\s*)[^\s,;()]+")
+
+
+def _toml_table_span(text: str, table: str) -> Optional[Tuple[int, int]]:
+    """
+    Return the (start, end) offsets of the body of `[table]` in `text`, or
+    None if the document has no such header.
+    """
+    header = re.search(
+        rf"^[ \t]*\[[ \t]*{re.escape(table)}[ \t]*\][ \t]*(?:#.*)?$",
+        text,
+        re.MULTILINE,
+    )
+    if header is None:
+        return None
+    following = _TOML_TABLE_HEADER.search(text, header.end())
+    return header.end(), following.start() if following else len(text)
+
+
+def _edit_toml_strings(text: str, edits: List[_TomlEdit]) -> str:
+    """
+    Replace string values in place, leaving comments, quoting, ordering and
+    whitespace untouched. Edits whose table or literal cannot be found are
+    skipped; the caller verifies the result.
+    """
+    for table, key, old, new in edits:
+        span = _toml_table_span(text, table)
+        if span is None:
+            continue
+        start, end = span
+        if key is None:
+            # An element of a string array, e.g. [project].dependencies.
+            pattern = re.compile(rf"(?P<q>[\"']){re.escape(old)}(?P=q)")
+            prefix = ""
+        else:
+            pattern = re.compile(
+                rf"^(?P<lhs>[ \t]*([\"']?){re.escape(key)}\2[ \t]*=[ \t]*)"
+                rf"(?P<q>[\"']){re.escape(old)}(?P=q)",
+                re.MULTILINE,
+            )
+            prefix = "lhs"
+        body = pattern.sub(
+            lambda m: f"{m[prefix] if prefix else ''}{m['q']}{new}{m['q']}",
+            text[start:end],
+        )
+        text = text[:start] + body + text[end:]
+    return text
+
 
 @dataclass(frozen=True)
 class PlannedUpgrade:
@@ -44,15 +128,21 @@ class PlannedUpgrade:
 
     Attributes:
         name: Package name.
-        current_spec: Current version specifier string (e.g. '==1.2.3' or '>=1.0'), may be None.
+        current_spec: Current version specifier string (e.g. '==1.2.3' or
+            '>=1.0'), may be None.
         target_version: Concrete version to upgrade to (e.g. '2.0.1').
         source_file: File where this dependency was originally declared.
+        canonical_name: PEP 503 normalized name, derived at construction.
     """
 
     name: str
     current_spec: Optional[str]
     target_version: str
     source_file: Path
+    canonical_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "canonical_name", name_key(self.name))
 
 
 @dataclass(frozen=True)
@@ -94,10 +184,17 @@ class UpgradeExecutor:
         self.project_root = project_root
         self.dependencies = dependencies
 
+        # Normalized name -> every declaration of it, for O(1) plan lookups.
+        self._deps_by_name: Dict[str, List[DependencySpec]] = defaultdict(list)
+        for dep in dependencies:
+            self._deps_by_name[dep.canonical_name].append(dep)
+
     # ------------------------------------------------------------------ #
     # Public API
     # ------------------------------------------------------------------ #
-    def execute(self, plans: List[PlannedUpgrade], dry_run: bool = False) -> List[UpgradeResult]:
+    def execute(
+        self, plans: List[PlannedUpgrade], dry_run: bool = False
+    ) -> List[UpgradeResult]:
         """
         Execute the given list of planned upgrades.
 
@@ -109,70 +206,83 @@ class UpgradeExecutor:
             List of UpgradeResult objects describing the outcome for each package.
         """
         results: List[UpgradeResult] = []
+        errors: Dict[str, str] = {}
 
         for plan in plans:
-            logger.info("Processing upgrade for %s -> %s", plan.name, plan.target_version)
-
+            logger.info(
+                "Processing upgrade for %s -> %s", plan.name, plan.target_version
+            )
             if dry_run:
-                logger.info("Dry-run: would run pip install --upgrade %s==%s", plan.name, plan.target_version)
-                results.append(
-                    UpgradeResult(
-                        name=plan.name,
-                        from_version=plan.current_spec,
-                        to_version=plan.target_version,
-                        success=True,
-                        error=None,
-                        dry_run=True,
-                    )
+                logger.info(
+                    "Dry-run: would run pip install --upgrade %s==%s",
+                    plan.name,
+                    plan.target_version,
                 )
-                continue
 
-            try:
-                self._run_pip_upgrade(plan)
-                self._update_dependency_files(plan)
-            except Exception as exc:
-                logger.error("Upgrade failed for %s: %s", plan.name, exc)
-                results.append(
-                    UpgradeResult(
-                        name=plan.name,
-                        from_version=plan.current_spec,
-                        to_version=plan.target_version,
-                        success=False,
-                        error=str(exc),
-                        dry_run=False,
-                    )
-                )
-                continue
+        if not dry_run and plans:
+            errors = self._run_pip_upgrades(plans)
 
+            # Rewrite declarations once per file for every installed upgrade,
+            # rather than re-reading and re-writing a file for each package.
+            upgraded = [plan for plan in plans if plan.name not in errors]
+            if upgraded:
+                errors.update(self._update_dependency_files(upgraded))
+
+        for plan in plans:
+            error = errors.get(plan.name)
             results.append(
                 UpgradeResult(
                     name=plan.name,
                     from_version=plan.current_spec,
                     to_version=plan.target_version,
-                    success=True,
-                    error=None,
-                    dry_run=False,
+                    success=error is None,
+                    error=error,
+                    dry_run=dry_run,
                 )
             )
 
+        return results
+
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
+    def _run_pip_upgrades(self, plans: List[PlannedUpgrade]) -> Dict[str, str]:
+        """
+        Install every plan with a single pip invocation, so pip resolves and
+        downloads once. If the batch fails, each plan is retried on its own so
+        one bad pin does not block the rest and errors are reported per plan.
+
+        Returns an error message per failed plan name.
+        """
+        if len(plans) > 1:
+            try:
+                self._pip_install(plans)
+                return {}
+            except subprocess.CalledProcessError as exc:
+                logger.warning(
+                    "Batch pip install failed, retrying one by one: %s", exc.stderr
+                )
+
+        errors: Dict[str, str] = {}
+        for plan in plans:
+            try:
+                self._run_pip_upgrade(plan)
+            except Exception as exc:
+                logger.error("Upgrade failed for %s: %s", plan.name, exc)
+                errors[plan.name] = str(exc)
+        return errors
+
+    def _pip_install(self, plans: List[PlannedUpgrade]) -> None:
+        subprocess.run(
+            install_command(f"{plan.name}=={plan.target_version}" for plan in plans),
+            check=True,
+            text=True,
+            capture_output=True,
+        )
+
     def _run_pip_upgrade(self, plan: PlannedUpgrade) -> None:
         try:
-            subprocess.run(
-                [
-                    sys.executable,
-                    "-m",
-                    "pip",
-                    "install",
-                    "--upgrade",
-                    f"{plan.name}=={plan.target_version}",
-                ],
-                check=True,
-                text=True,
-                capture_output=True,
-            )
+            self._pip_install([plan])
         except subprocess.CalledProcessError as exc:
             logger.error("pip install failed for %s: %s", plan.name, exc.stderr)
             raise UpgradeExecutionError(
@@ -182,89 +292,159 @@ class UpgradeExecutor:
     def _backup_file(self, path: Path) -> None:
         backup = path.with_suffix(path.suffix + ".depup.bak")
         if not backup.exists():
-            backup.write_text(path.read_text())
+            # Kernel-side copy (sendfile / copy_file_range); no decode/encode.
+            shutil.copyfile(path, backup)
 
-    def _update_dependency_files(self, plan: PlannedUpgrade) -> None:
+    def _update_dependency_files(self, plans: List[PlannedUpgrade]) -> Dict[str, str]:
         """
-        Update dependency declarations in supported files after a successful upgrade.
+        Update dependency declarations in supported files after successful upgrades.
 
         - requirements.txt
         - pyproject.toml
         - Pipfile
+
+        Each declaring file is loaded, rewritten for all of its packages and
+        written once. Returns an error message per plan name for plans whose
+        file could not be updated.
+        """
+        # path -> {normalized name: target version}, plus the plans touching it
+        targets_by_file: Dict[Path, Dict[str, str]] = defaultdict(dict)
+        plans_by_file: Dict[Path, List[PlannedUpgrade]] = defaultdict(list)
+        for plan in plans:
+            for spec in self._deps_by_name.get(plan.canonical_name, ()):
+                if spec.source_file is None:
+                    continue
+                targets = targets_by_file[spec.source_file]
+                if spec.canonical_name not in targets:
+                    targets[spec.canonical_name] = plan.target_version
+                    plans_by_file[spec.source_file].append(plan)
+
+        errors: Dict[str, str] = {}
+        for path, targets in targets_by_file.items():
+            try:
+                if path.name == "requirements.txt":
+                    self._update_requirements_entries(path, targets)
+                elif path.name == "pyproject.toml":
+                    for key in self._update_pyproject(path, targets):
+                        for plan in plans_by_file[path]:
+                            if plan.canonical_name == key:
+                                errors[plan.name] = (
+                                    f"Could not rewrite the {plan.name} "
+                                    f"specifier in {path}"
+                                )
+                elif path.name == "Pipfile":
+                    self._update_pipfile(path, targets)
+            except FileNotFoundError:
+                # Opening the file is the existence check; no separate stat.
+                logger.warning("Dependency file %s does not exist", path)
+            except Exception as exc:
+                logger.error("Updating %s failed: %s", path, exc)
+                for plan in plans_by_file[path]:
+                    errors[plan.name] = str(exc)
+
+        return errors
+
+    def _write_toml(
+        self,
+        path: Path,
+        text: str,
+        data: Dict[str, Any],
+        edits: List[_TomlEdit],
+    ) -> None:
         """
-        matching_specs = [
-            d for d in self.dependencies if d.name.lower() == plan.name.lower()
-        ]
-
-        for spec in matching_specs:
-            if spec.source_file.name == "requirements.txt":
-                self._update_requirements_entry(spec.source_file, spec.name, plan.target_version)
-            elif spec.source_file.name == "pyproject.toml":
-                self._update_pyproject(spec.source_file, spec.name, plan.target_version)
-            elif spec.source_file.name == "Pipfile":
-                self._update_pipfile(spec.source_file, spec.name, plan.target_version)
+        Write `data` back to a TOML file, editing the changed string values in
+        place so the rest of the file is kept byte for byte.
+
+        The edited text is re-parsed and must equal `data`; layouts the
+        in-place edit does not cover (escaped strings, dotted keys, inline
+        tables) fall back to re-serializing the whole document.
+        """
+        new_text = _edit_toml_strings(text, edits)
+        try:
+            in_place = tomllib.loads(new_text) == data
+        except tomllib.TOMLDecodeError:
+            in_place = False
+        if not in_place:
+            logger.debug("Could not edit %s in place; re-serializing it", path)
+            new_text = tomli_w.dumps(data)
+
+        self._backup_file(path)
+        path.write_text(new_text, encoding="utf-8")
 
     # ----------------- requirements.txt -------------------------------- #
-    def _update_requirements_entry(self, path: Path, package: str, new_version: str) -> None:
+    def _update_requirements_entries(
+        self, path: Path, targets: Mapping[str, str]
+    ) -> None:
         """
-        Rewrite a single package line in requirements.txt to point to new_version.
+        Rewrite the package lines in requirements.txt named in `targets`.
 
-        Only lines that match `<package><op><version>` are changed. Operators and comments are preserved.
+        `targets` maps normalized package names to their new versions. Only
+        lines that match `<package><op><version>` are changed. Operators and
+        comments are preserved.
 
         Example:
             requests==1.0.0   -> requests==2.0.0
             requests>=1.0.0   -> requests>=2.0.0
         """
-        if not path.exists():
-            logger.warning("requirements.txt file %s does not exist", path)
-            return
+        logger.info("Updating %s entries for %s", path, ", ".join(targets))
+        text = path.read_text()
 
-        logger.info("Updating %s entry for %s to version %s", path, package, new_version)
-        lines = path.read_text().splitlines()
-        updated_lines: List[str] = []
+        # One alternation of every target (any separator spelling, any case)
+        # rewrites the whole file in a single regex pass.
+        pattern = _requirement_pins_for(targets)
 
-        pattern = re.compile(
-            rf"^(\s*)({re.escape(package)})(\s*[<>=!~]+)([^;\s]+)(.*)$",
-            re.IGNORECASE,
-        )
+        def replace(match: re.Match[str]) -> str:
+            prefix_ws, name, op, _old_version, suffix = match.groups()
+            new_version = targets[name_key(name)]
+            return f"{prefix_ws}{name}{op}{new_version}{suffix}"
 
-        for line in lines:
-            match = pattern.match(line)
-            if match:
-                prefix_ws, name, op, _old_version, suffix = match.groups()
-                new_line = f"{prefix_ws}{name}{op}{new_version}{suffix}"
-                updated_lines.append(new_line)
-            else:
-                updated_lines.append(line)
+        updated, count = pattern.subn(replace, text)
+        if not count:
+            logger.info("No pinned entries to update in %s", path)
+            return
 
         self._backup_file(path)
-        path.write_text("\n".join(updated_lines) + "\n")
+        path.write_text(updated)
 
     # ----------------- pyproject.toml ---------------------------------- #
-    def _update_pyproject(self, path: Path, package: str, new_version: str) -> None:
+    def _update_pyproject(self, path: Path, targets: Mapping[str, str]) -> Set[str]:
         """
-        Update pyproject.toml dependency declarations for a given package.
+        Update pyproject.toml dependency declarations for the packages in `targets`.
 
         Supported:
         - [project].dependencies (PEP 621, list of strings)
         - [tool.poetry.dependencies] (simple string values)
-        """
-        if not path.exists():
-            logger.warning("pyproject.toml file %s does not exist", path)
-            return
 
-        content = path.read_text()
-        data: Dict[str, Any] = tomllib.loads(content)
-        updated = False
+        Returns the normalized names of PEP 621 entries that name a target but
+        whose specifier could not be rewritten (e.g. ">=1.0,<2"); those are
+        left as they were.
+        """
+        text = path.read_text(encoding="utf-8")
+        data: Dict[str, Any] = tomllib.loads(text)
+        edits: List[_TomlEdit] = []
+        unrewritten: Set[str] = set()
 
         # PEP 621: [project].dependencies = [ "pkg>=1.0", "other" ]
         project_section = data.get("project")
         if project_section and isinstance(project_section.get("dependencies"), list):
             new_deps: List[str] = []
             for dep_str in project_section["dependencies"]:
-                new_dep_str = self._rewrite_pep621_entry(dep_str, package, new_version)
-                if new_dep_str != dep_str:
-                    updated = True
+                entry = _PEP621_ENTRY.match(dep_str)
+                key = name_key(entry["name"]) if entry else None
+                new_version = targets.get(key) if key else None
+                if entry is None or key is None or new_version is None:
+                    new_deps.append(dep_str)
+                    continue
+
+                new_dep_str = self._rewrite_pep621_entry(entry, new_version)
+                if new_dep_str is None:
+                    logger.warning(
+                        "Cannot rewrite specifier of %r in %s", dep_str, path
+                    )
+                    unrewritten.add(key)
+                    new_dep_str = dep_str
+                elif new_dep_str != dep_str:
+                    edits.append(("project", None, dep_str, new_dep_str))
                 new_deps.append(new_dep_str)
             project_section["dependencies"] = new_deps
 
@@ -275,42 +455,55 @@ class UpgradeExecutor:
 
         if isinstance(poetry_deps, dict):
             for name, value in list(poetry_deps.items()):
-                if name.lower() != package.lower():
+                new_version = targets.get(name_key(name))
+                if new_version is None:
                     continue
                 if isinstance(value, str):
                     new_value = self._rewrite_version_literal(value, new_version)
                     if new_value != value:
                         poetry_deps[name] = new_value
-                        updated = True
+                        edits.append(
+                            ("tool.poetry.dependencies", name, value, new_value)
+                        )
                 else:
                     logger.info(
-                        "Skipping complex Poetry dependency for %s in %s (non-string value).",
-                        package,
+                        "Skipping complex Poetry dependency for %s in %s "
+                        "(non-string value).",
+                        name,
                         path,
                     )
 
-        if updated:
-            logger.info("Writing updated pyproject.toml for %s", package)
-            self._backup_file(path)
-            path.write_text(tomli_w.dumps(data))
+        if edits:
+            logger.info("Writing updated pyproject.toml for %s", ", ".join(targets))
+            self._write_toml(path, text, data, edits)
+
+        return unrewritten
 
-    def _rewrite_pep621_entry(self, dep_str: str, package: str, new_version: str) -> str:
+    def _rewrite_pep621_entry(
+        self, entry: re.Match[str], new_version: str
+    ) -> Optional[str]:
         """
-        Rewrite a single PEP 621 dependency string if it matches `package`.
+        Rewrite the version of a matched PEP 621 dependency string, keeping
+        the name, [extras], operator and "; marker" exactly as written.
+
+        Returns None if the specifier has more than one clause or is not
+        understood.
 
         Example:
-            "requests>=2.30.0" -> "requests>=2.31.0"
-            "numpy"            -> unchanged (no version to rewrite)
+            "requests>=2.30.0"              -> "requests>=2.31.0"
+            "foo[bar] >=1.0; os_name=='nt'" -> "foo[bar] >=2.0; os_name=='nt'"
+            "numpy"                         -> unchanged (no version to rewrite)
+            "attrs>=21,<24"                 -> None
         """
-        ops = ["==", ">=", "<=", "~=", "!=", "<", ">"]
-        for op in ops:
-            if op in dep_str:
-                name_part, version_part = dep_str.split(op, 1)
-                name = name_part.strip()
-                if name.lower() != package.lower():
-                    return dep_str
-                return f"{name}{op}{new_version}"
-        return dep_str
+        spec = entry["spec"]
+        if not spec:
+            return entry.string
+
+        clause = _SINGLE_SPECIFIER.fullmatch(spec)
+        if clause is None:
+            return None
+        head, tail = entry["head"], entry["tail"]
+        return f"{head}{clause['op']}{clause['ws']}{new_version}{tail}"
 
     def _rewrite_version_literal(self, spec: str, new_version: str) -> str:
         """
@@ -334,9 +527,9 @@ class UpgradeExecutor:
         return spec
 
     # ----------------- Pipfile ----------------------------------------- #
-    def _update_pipfile(self, path: Path, package: str, new_version: str) -> None:
+    def _update_pipfile(self, path: Path, targets: Mapping[str, str]) -> None:
         """
-        Update Pipfile dependency declarations for a given package.
+        Update Pipfile dependency declarations for the packages in `targets`.
 
         Supported:
         - [packages]
@@ -344,33 +537,30 @@ class UpgradeExecutor:
 
         Only simple string values are updated; wildcard "*" is left as-is.
         """
-        if not path.exists():
-            logger.warning("Pipfile %s does not exist", path)
-            return
-
-        content = path.read_text()
-        data: Dict[str, Any] = tomllib.loads(content)
-        updated = False
+        text = path.read_text(encoding="utf-8")
+        data: Dict[str, Any] = tomllib.loads(text)
+        edits: List[_TomlEdit] = []
 
         for section_name in ("packages", "dev-packages"):
             section = data.get(section_name)
             if isinstance(section, dict):
                 for name, value in list(section.items()):
-                    if name.lower() != package.lower():
+                    new_version = targets.get(name_key(name))
+                    if new_version is None:
                         continue
                     if isinstance(value, str):
                         new_value = self._rewrite_version_literal(value, new_version)
                         if new_value != value:
                             section[name] = new_value
-                            updated = True
+                            edits.append((section_name, name, value, new_value))
                     else:
                         logger.info(
-                            "Skipping complex Pipfile entry for %s in section [%s] (non-string value).",
-                            package,
+                            "Skipping complex Pipfile entry for %s in section "
+                            "[%s] (non-string value).",
+                            name,
                             section_name,
                         )
 
-        if updated:
-            logger.info("Writing updated Pipfile for %s", package)
-            self._backup_file(path)
-            path.write_text(tomli_w.dumps(data))
+        if edits:
+            logger.info("Writing updated Pipfile for %s", ", ".join(targets))
+            self._write_toml(path, text, data, edits)
@@ -1,22 +1,103 @@
 from __future__ import annotations
 
 import concurrent.futures
-from typing import List, Optional
+import json
+import re
+import time
+from dataclasses import replace
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import requests
-from packaging.version import InvalidVersion, Version, parse as parse_version
+from packaging.utils import (
+    InvalidSdistFilename,
+    InvalidWheelFilename,
+    parse_sdist_filename,
+    parse_wheel_filename,
+)
+from packaging.version import InvalidVersion, Version
+from packaging.version import parse as parse_version
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from depup.core.cache import CacheEntry, PyPICache
 from depup.core.models import DependencySpec, UpdateType, VersionInfo
 
+try:  # optional C parser, installed with the "fast" extra
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+_SIMPLE_VERSION = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+_PLAIN_RELEASE = re.compile(r"\d+(?:\.\d+)*")
+# Two-character operators first, so ">=" is not read as ">".
+_SPEC_OPERATOR = re.compile(r"==|>=|<=|~=|!=|>|<")
+# A "version" key in raw JSON. Quotes inside JSON strings are always
+# escaped, so a bare quote after "," or "{" can only start a real key.
+_JSON_VERSION_KEY = re.compile(rb'[,{]\s*"version"\s*:\s*"([^"\\]+)"')
+# Opening of a /pypi/<pkg>/json document whose first key is "info", compact
+# (PyPI) or pretty-printed (some mirrors).
+_JSON_INFO_FIRST = re.compile(rb'\s*\{\s*"info"\s*:')
+
+
+def _release_key(s: str) -> Tuple[int, ...]:
+    """
+    Ordering key for a plain release string ("1.10.0"); trailing zeros are
+    dropped so "1.0" and "1.0.0" compare equal, as they do for Version.
+    """
+    parts = [int(p) for p in s.split(".")]
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def _version_or_none(s: str) -> Optional[Version]:
+    try:
+        v = parse_version(s)
+    except InvalidVersion:
+        return None
+    return v if isinstance(v, Version) else None
+
+
+@lru_cache(maxsize=4096)
+def _normalize_declared(spec: str) -> Optional[str]:
+    """
+    Strip the leading operator from a declared spec ("==1.2.3" -> "1.2.3").
+    Cached like _parse_version: declared specs repeat across files and scans.
+    """
+    spec = spec.strip()
+    if not spec:
+        return None
+
+    op = _SPEC_OPERATOR.match(spec)
+    if op:
+        return spec[op.end():].strip()
+
+    # Unhandled forms (e.g., "requests[security]>=2.0") should be treated
+    # carefully elsewhere
+    return spec
+
+
+@lru_cache(maxsize=4096)
+def _parse_version(s: str) -> Optional[Version]:
+    """
+    Parse a version string once per process; the same strings recur across
+    packages and across the repeated classifications of a single run.
+    """
+    return _version_or_none(s)
+
 
 class VersionScannerError(Exception):
     """Raised when version scanning fails."""
 
 
 class VersionScanner:
+    SIMPLE_URL = "https://pypi.org/simple/{package}/"
+    SIMPLE_ACCEPT = "application/vnd.pypi.simple.v1+json"
     PYPI_URL = "https://pypi.org/pypi/{package}/json"
     TIMEOUT = 8
-    MAX_WORKERS = 12
+    MAX_WORKERS = 32
 
     IGNORE = {
         "pip",
@@ -28,34 +109,155 @@ class VersionScanner:
         "pip-tools",
     }
 
-    def scan(self, deps: List[DependencySpec]) -> List[VersionInfo]:
-        filtered = [d for d in deps if d.name.lower() not in self.IGNORE]
+    def __init__(self, cache: Optional[PyPICache] = None) -> None:
+        self._session = self._build_session()
+        self._cache = cache
+
+    def _build_session(self) -> requests.Session:
+        """
+        Build one keep-alive session shared by every lookup. Each worker
+        thread opens at most one connection to pypi.org and reuses it for all
+        of its requests, so a scan pays for at most MAX_WORKERS handshakes.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            # One host (pypi.org); keep exactly one idle connection per worker.
+            pool_connections=1,
+            pool_maxsize=self.MAX_WORKERS,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        session.mount("https://", adapter)
+        return session
+
+    def scan(
+        self,
+        deps: List[DependencySpec],
+        only: Optional[Set[str]] = None,
+    ) -> List[VersionInfo]:
+        """
+        Look up the latest version of each dependency on PyPI.
+
+        A package declared in several files is looked up once; each distinct
+        declared spec still yields its own VersionInfo, classified against
+        that spec.
+
+        Args:
+            deps: Dependencies to scan.
+            only: Optional set of normalized package names; when given, all
+                other dependencies are skipped before any network request.
+        """
+        # Normalized name -> declared spec -> first dependency declaring it.
+        by_name: Dict[str, Dict[str, DependencySpec]] = {}
+        for d in deps:
+            name = d.canonical_name
+            if name in self.IGNORE or (only and name not in only):
+                continue
+            by_name.setdefault(name, {}).setdefault(d.version or "", d)
+
+        # Fresh cache entries are answered inline; only the rest need threads
+        # and connections.
+        results: List[VersionInfo] = []
+        pending: List[Tuple[DependencySpec, Optional[CacheEntry]]] = []
+        for name, specs in by_name.items():
+            cached = self._cache.get(name) if self._cache else None
+            if cached and self._cache and self._cache.is_fresh(cached):
+                results.extend(self._info_from_cache(d, cached) for d in specs.values())
+            else:
+                # One lookup per package, made for its first declaration.
+                pending.append((next(iter(specs.values())), cached))
+        if not pending:
+            return results
+
+        try:
+            fetched = self._fetch_all(pending)
+        finally:
+            # Persist what was resolved, even when a later lookup failed.
+            if self._cache:
+                self._cache.flush()
+
+        for info in fetched:
+            results.append(info)
+            results.extend(
+                self._info_for(d, info.latest or "")
+                for declared, d in by_name[info.canonical_name].items()
+                if declared != (info.current or "")
+            )
+        return results
+
+    def _fetch_all(
+        self,
+        pending: List[Tuple[DependencySpec, Optional[CacheEntry]]],
+    ) -> List[VersionInfo]:
+        # Lookups are pure network I/O, so every request is in flight at once
+        # up to MAX_WORKERS; never open more threads (and so connections) than
+        # there are requests to make.
+        workers = min(self.MAX_WORKERS, len(pending))
 
         results: List[VersionInfo] = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
-            future_map = {executor.submit(self._fetch_version_info, dep): dep for dep in filtered}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_map = {
+                executor.submit(self._fetch_version_info, dep, cached): dep
+                for dep, cached in pending
+            }
 
             for future in concurrent.futures.as_completed(future_map):
                 dep = future_map[future]
                 try:
                     info = future.result()
                 except Exception as exc:
-                    raise VersionScannerError(f"Failed to scan {dep.name}: {exc}") from exc
+                    # Drop lookups that have not started yet instead of
+                    # waiting for the whole queue before reporting the error.
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise VersionScannerError(
+                        f"Failed to scan {dep.name}: {exc}"
+                    ) from exc
                 if info:
                     results.append(info)
 
         return results
 
-    def _fetch_version_info(self, dep: DependencySpec) -> VersionInfo:
+    def _info_from_cache(self, dep: DependencySpec, cached: CacheEntry) -> VersionInfo:
+        return self._info_for(dep, cached.latest)
+
+    def _info_for(self, dep: DependencySpec, latest: str) -> VersionInfo:
+        declared = dep.version or ""
+        return VersionInfo(
+            name=dep.name,
+            current=declared,
+            latest=latest,
+            update_type=self._classify(declared, latest),
+        )
+
+    def _fetch_version_info(
+        self,
+        dep: DependencySpec,
+        cached: Optional[CacheEntry] = None,
+    ) -> VersionInfo:
         pkg = dep.name
+        key = dep.canonical_name
         declared = dep.version or ""
 
-        try:
-            response = requests.get(self.PYPI_URL.format(package=pkg), timeout=self.TIMEOUT)
-        except Exception as exc:
-            raise RuntimeError(f"Network error fetching {pkg}: {exc}") from exc
+        headers: Dict[str, str] = {"Accept": self.SIMPLE_ACCEPT}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
 
-        if response.status_code != 200:
+        # The PEP 691 JSON Simple API lists only versions and files, a fraction
+        # of the full /pypi/<pkg>/json document (descriptions, per-release URLs).
+        response = self._get(self.SIMPLE_URL.format(package=key), headers)
+
+        if response.status_code == 304 and cached:
+            if self._cache:
+                self._cache.set(key, replace(cached, fetched_at=time.time()))
+            return self._info_from_cache(dep, cached)
+
+        # Indexes without PEP 691 support may refuse the JSON Accept type
+        # outright; the /pypi/<pkg>/json API below still answers those.
+        not_acceptable = response.status_code == 406
+
+        if response.status_code != 200 and not not_acceptable:
             # Can't resolve latest -> treat as UNKNOWN
             return VersionInfo(
                 name=pkg,
@@ -64,8 +266,29 @@ class VersionScanner:
                 update_type=UpdateType.NONE,
             )
 
-        data = response.json()
-        latest = (data.get("info") or {}).get("version", "") or ""
+        # Mirrors and proxies may ignore the Accept header and serve HTML.
+        latest = None
+        content_type = response.headers.get("Content-Type", "")
+        if not not_acceptable and content_type.startswith(self.SIMPLE_ACCEPT):
+            latest = self._latest_from_simple(self._decode(response))
+        if latest is None:
+            latest = self._latest_from_json_api(pkg)
+
+        if self._cache:
+            # Validators of a refused request must not be replayed later.
+            self._cache.set(
+                key,
+                CacheEntry(
+                    latest=latest,
+                    etag=None if not_acceptable else response.headers.get("ETag"),
+                    last_modified=(
+                        None
+                        if not_acceptable
+                        else response.headers.get("Last-Modified")
+                    ),
+                    fetched_at=time.time(),
+                ),
+            )
 
         update_type = self._classify(declared, latest)
 
@@ -76,26 +299,97 @@ class VersionScanner:
             update_type=update_type,
         )
 
-    def _normalize_declared(self, spec: str) -> Optional[str]:
-        spec = (spec or "").strip()
-        if not spec:
+    def _get(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        try:
+            return self._session.get(url, headers=headers, timeout=self.TIMEOUT)
+        except Exception as exc:
+            raise RuntimeError(f"Network error fetching {url}: {exc}") from exc
+
+    @staticmethod
+    def _decode(response: requests.Response) -> Any:
+        """
+        Decode a JSON response body, using orjson when it is installed.
+        """
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return json.loads(response.content)
+
+    def _latest_from_simple(self, data: Dict[str, Any]) -> Optional[str]:
+        """
+        Pick the latest release from a JSON Simple API project page.
+
+        Mirrors PyPI's own notion of "latest": the highest non-yanked final
+        release, or the highest pre-release if there are no final releases.
+        Returns None if the page has no "versions" list (pre-PEP 700 index).
+        """
+        versions = data.get("versions")
+        if not isinstance(versions, list):
             return None
 
-        for op in ("==", ">=", "<=", "~=", "!=", ">", "<"):
-            if spec.startswith(op):
-                return spec[len(op):].strip()
+        yanked = self._yanked_versions(data.get("files") or [])
+        if not yanked:
+            # Plain X.Y[.Z...] releases (nearly all of a typical history) are
+            # ranked by integer tuples; only their winner and the remaining
+            # pre/post/dev strings go through the full PEP 440 parser.
+            plain = [s for s in versions if _PLAIN_RELEASE.fullmatch(s)]
+            versions = [s for s in versions if not _PLAIN_RELEASE.fullmatch(s)]
+            if plain:
+                versions.append(max(plain, key=_release_key))
 
-        # Unhandled forms (e.g., "requests[security]>=2.0") should be treated carefully elsewhere
-        return spec.strip()
+        candidates: List[Tuple[Version, str]] = [
+            (v, s)
+            for s in versions
+            if (v := _version_or_none(s)) is not None and v not in yanked
+        ]
+        final = [c for c in candidates if not c[0].is_prerelease]
+        pool = final or candidates
+        if not pool:
+            return ""
+        return max(pool, key=lambda c: c[0])[1]
+
+    def _yanked_versions(self, files: List[Dict[str, Any]]) -> Set[Version]:
+        """
+        Versions with at least one yanked file. Yanks (PEP 592) are made per
+        release, so only the (rare) yanked filenames need to be parsed.
+        """
+        yanked: Set[Version] = set()
+        for f in files:
+            if not f.get("yanked"):
+                continue
+            filename = f.get("filename", "")
+            try:
+                if filename.endswith(".whl"):
+                    yanked.add(parse_wheel_filename(filename)[1])
+                elif filename.endswith((".tar.gz", ".zip")):
+                    yanked.add(parse_sdist_filename(filename)[1])
+            except (InvalidWheelFilename, InvalidSdistFilename, InvalidVersion):
+                continue
+        return yanked
+
+    def _latest_from_json_api(self, pkg: str) -> str:
+        response = self._get(self.PYPI_URL.format(package=pkg), {})
+        if response.status_code != 200:
+            return ""
+        # The document is mostly "releases" (every file of every release);
+        # info.version sits before it, so read the key from the raw bytes and
+        # decode the whole body only if that fails.
+        content = response.content
+        if _JSON_INFO_FIRST.match(content):
+            end = content.find(b'"releases"')
+            match = _JSON_VERSION_KEY.search(
+                content, 0, end if end != -1 else len(content)
+            )
+            if match:
+                return match.group(1).decode()
+
+        data = self._decode(response)
+        return (data.get("info") or {}).get("version", "") or ""
+
+    def _normalize_declared(self, spec: str) -> Optional[str]:
+        return _normalize_declared(spec or "")
 
     def _safe_version(self, s: str) -> Optional[Version]:
-        try:
-            v = parse_version(s)
-            if isinstance(v, Version):
-                return v
-            return None
-        except InvalidVersion:
-            return None
+        return _parse_version(s)
 
     def _classify(self, current_spec: str, latest: str) -> UpdateType:
         current_norm = self._normalize_declared(current_spec)
@@ -107,6 +401,17 @@ class VersionScanner:
         # If we don't know what the user declared, we can’t reliably classify.
         if not current_norm:
             return UpdateType.NONE
+
+        # Fast path: plain X.Y.Z on both sides (the overwhelmingly common case)
+        # compares as integer tuples without building Version objects.
+        c_simple = _SIMPLE_VERSION.fullmatch(current_norm)
+        l_simple = _SIMPLE_VERSION.fullmatch(latest_norm)
+        if c_simple and l_simple:
+            return self._classify_release(
+                tuple(map(int, c_simple.groups())),
+                tuple(map(int, l_simple.groups())),
+            )
+
         c = self._safe_version(current_norm)
         l = self._safe_version(latest_norm)
 
@@ -124,3 +429,14 @@ class VersionScanner:
         if l.minor > c.minor:
             return UpdateType.MINOR
         return UpdateType.PATCH
+
+    def _classify_release(
+        self, current: Tuple[int, ...], latest: Tuple[int, ...]
+    ) -> UpdateType:
+        if latest <= current:
+            return UpdateType.NONE
+        if latest[0] > current[0]:
+            return UpdateType.MAJOR
+        if latest[1] > current[1]:
+            return UpdateType.MINOR
+        return UpdateType.PATCH
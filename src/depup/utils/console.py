@@ -0,0 +1,24 @@
+"""
+Shared Rich console.
+
+Every CLI module prints through the single instance returned by
+`get_console()` instead of creating its own, so terminal detection and
+console setup happen once per process. Rich itself is imported on first use,
+which keeps it off the startup path of commands that never print through it
+(e.g. piped `scan --json`).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+@lru_cache(maxsize=1)
+def get_console() -> Console:
+    from rich.console import Console
+
+    return Console()
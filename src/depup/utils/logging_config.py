@@ -1,12 +1,21 @@
 import logging
 
+# Built once; every configure_logging() call reuses it.
+_FORMATTER = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
 
 def configure_logging(verbose: bool = False) -> None:
     """
     Configure logging for the entire depup application.
+
+    Like logging.basicConfig, this does nothing once the root logger has a
+    handler (an earlier call, an embedding application or a test runner).
     """
-    level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-    )
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(_FORMATTER)
+    root.addHandler(handler)
+    root.setLevel(logging.DEBUG if verbose else logging.INFO)
@@ -1,66 +1,144 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import List
+import os
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Iterable, List, Mapping, Sequence, Tuple
 
-from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
-from depup.core.models import DependencySpec, VersionInfo, UpdateType
-from depup.core.upgrade_executor import PlannedUpgrade, UpgradeResult
+from depup.core.models import EMPTY_INFO, DependencySpec, VersionInfo, UpdateType
+from depup.utils.console import get_console
 
-console = Console()
+if TYPE_CHECKING:
+    from depup.core.upgrade_executor import PlannedUpgrade, UpgradeResult
 
 
 # ---------------------------------------------------------------------
-# TABLE RENDERERS
+# HELPERS
 # ---------------------------------------------------------------------
-def render_env_upgrade_table(infos: List[VersionInfo]) -> None:
-    table = Table(title="Environment Upgrade Plan")
-    table.add_column("Package", style="cyan")
-    table.add_column("Current", style="green")
-    table.add_column("Latest", style="yellow")
-    table.add_column("Update Type", style="red")
+def _add_rows(table: Table, rows: Iterable[Sequence[Any]]) -> None:
+    """
+    Append prebuilt row tuples; cell values are resolved before touching Rich.
+    """
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
+
+
+def _use_rich() -> bool:
+    """
+    Draw Rich tables only for an interactive terminal. Piped or redirected
+    output (and DEPUP_PLAIN=1) gets plain aligned text, which skips Rich's
+    per-cell measuring and wrapping.
+    """
+    return get_console().is_terminal and not os.environ.get("DEPUP_PLAIN")
+
+
+def _plain_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    return value.value if isinstance(value, Enum) else str(value)
+
+
+def _write_plain(
+    title: str, headers: Sequence[str], rows: Sequence[Sequence[Any]]
+) -> None:
+    """
+    Write a title and left-aligned columns in a single write call.
+    """
+    cells = [[_plain_cell(v) for v in row] for row in rows]
+    widths = [len(h) for h in headers]
+    for row in cells:
+        widths = [max(w, len(v)) for w, v in zip(widths, row)]
+
+    def line(values: Sequence[str]) -> str:
+        return "  ".join(v.ljust(w) for v, w in zip(values, widths)).rstrip()
+
+    out = [title, line(headers), line(["-" * w for w in widths])]
+    out.extend(line(row) for row in cells)
+    get_console().file.write("\n".join(out) + "\n")
+
+
+def _emit_table(
+    title: str,
+    columns: Sequence[Tuple[str, str]],
+    rows: Sequence[Sequence[Any]],
+) -> None:
+    """
+    Print `rows` under `columns` ((header, style) pairs) as a Rich table on
+    a terminal, or as plain text otherwise.
+    """
+    if not _use_rich():
+        _write_plain(title, [header for header, _ in columns], rows)
+        return
+
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    # Text cells are taken as-is: no markup, emoji or highlighter pass per
+    # cell, and names or specs containing "[" are never read as markup. The
+    # column style still applies.
+    _add_rows(table, ([Text(_plain_cell(v)) for v in row] for row in rows))
+    get_console().print(table)
 
-    for info in infos:
-        table.add_row(info.name, info.current, info.latest, info.update_type)
 
-    console.print(table)
+# ---------------------------------------------------------------------
+# TABLE RENDERERS
+# ---------------------------------------------------------------------
+def render_env_upgrade_table(infos: List[VersionInfo]) -> None:
+    _emit_table(
+        "Environment Upgrade Plan",
+        [
+            ("Package", "cyan"),
+            ("Current", "green"),
+            ("Latest", "yellow"),
+            ("Update Type", "red"),
+        ],
+        [(info.name, info.current, info.latest, info.update_type) for info in infos],
+    )
 
 
 def render_file_upgrade_table(plans: List[PlannedUpgrade], infos: List[VersionInfo], dry_run: bool) -> None:
-    table = Table(title="Planned Upgrades (dry-run)" if dry_run else "Planned Upgrades")
-    table.add_column("Package", style="cyan")
-    table.add_column("Current Spec", style="green")
-    table.add_column("Target Version", style="yellow")
-    table.add_column("Update Type", style="red")
-    table.add_column("Source File", style="magenta")
-
-    info_by_name = {i.name.lower(): i for i in infos}
-
-    for plan in plans:
-        info = info_by_name.get(plan.name.lower())
-        table.add_row(
+    info_by_key = {i.join_key: i for i in infos}
+
+    rows = [
+        (
             plan.name,
             plan.current_spec or "",
             plan.target_version,
             info.update_type if info else "unknown",
             plan.source_file.name,
         )
-
-    console.print(table)
+        for plan in plans
+        for info in (info_by_key.get((plan.canonical_name, plan.current_spec or "")),)
+    ]
+
+    _emit_table(
+        "Planned Upgrades (dry-run)" if dry_run else "Planned Upgrades",
+        [
+            ("Package", "cyan"),
+            ("Current Spec", "green"),
+            ("Target Version", "yellow"),
+            ("Update Type", "red"),
+            ("Source File", "magenta"),
+        ],
+        rows,
+    )
 
 
 # ---------------------------------------------------------------------
 # SUMMARY
 # ---------------------------------------------------------------------
 def render_upgrade_summary(results: List[UpgradeResult]) -> None:
-    succeeded = [r for r in results if r.success]
+    # One pass: only the failures need to be kept.
     failed = [r for r in results if not r.success]
+    succeeded = len(results) - len(failed)
 
+    console = get_console()
     console.print()
     console.print(
-        f"[green]Upgrades succeeded: {len(succeeded)}[/green], "
+        f"[green]Upgrades succeeded: {succeeded}[/green], "
         f"[red]failed: {len(failed)}[/red]"
     )
 
@@ -72,70 +150,74 @@ def render_upgrade_summary(results: List[UpgradeResult]) -> None:
 # ENVIRONMENT TABLES
 # ---------------------------------------------------------------------
 def render_env_table(deps: List[DependencySpec]) -> None:
-    table = Table(title="Installed Environment Packages")
-    table.add_column("Package", style="cyan")
-    table.add_column("Version", style="green")
-
-    for dep in deps:
-        table.add_row(dep.name, dep.version or "")
-
-    console.print(table)
-
-
-def render_latest_env_table(deps: List[DependencySpec], infos: List[VersionInfo]) -> None:
-    info_by_name = {i.name.lower(): i for i in infos}
+    _emit_table(
+        "Installed Environment Packages",
+        [("Package", "cyan"), ("Version", "green")],
+        [(dep.name, dep.version or "") for dep in deps],
+    )
 
-    table = Table(title="Installed Packages (with latest versions)")
-    table.add_column("Package", style="cyan")
-    table.add_column("Installed", style="green")
-    table.add_column("Latest", style="yellow")
-    table.add_column("Update Type", style="red")
 
-    for dep in deps:
-        info = info_by_name.get(dep.name.lower())
-        table.add_row(
-            dep.name,
-            dep.version or "",
-            info.latest if info else "",
-            info.update_type if info else UpdateType.NONE,
-        )
-
-    console.print(table)
+def render_latest_env_table(
+    deps: List[DependencySpec],
+    info_by_key: Mapping[Tuple[str, str], VersionInfo],
+    outdated_only: bool = False,
+) -> None:
+    rows = [
+        (dep.name, dep.version or "", info.latest or "", info.update_type)
+        for dep in deps
+        for info in (info_by_key.get(dep.join_key, EMPTY_INFO),)
+        # Unknown lookups fall back to EMPTY_INFO, so they are skipped as well.
+        if not outdated_only or info.update_type != UpdateType.NONE
+    ]
+    _emit_table(
+        "Installed Packages (with latest versions)",
+        [
+            ("Package", "cyan"),
+            ("Installed", "green"),
+            ("Latest", "yellow"),
+            ("Update Type", "red"),
+        ],
+        rows,
+    )
 
 
 # ---------------------------------------------------------------------
 # FILE-BASED TABLES
 # ---------------------------------------------------------------------
 def render_declared_file_table(deps: List[DependencySpec]) -> None:
-    table = Table(title="Declared Dependencies")
-    table.add_column("Package", style="cyan")
-    table.add_column("Version Spec", style="green")
-    table.add_column("Source File", style="magenta")
-
-    for dep in deps:
-        table.add_row(dep.name, dep.version or "", dep.source_file.name)
-
-    console.print(table)
-
-
-def render_latest_file_table(deps: List[DependencySpec], infos: List[VersionInfo]) -> None:
-    info_by_name = {i.name.lower(): i for i in infos}
+    _emit_table(
+        "Declared Dependencies",
+        [("Package", "cyan"), ("Version Spec", "green"), ("Source File", "magenta")],
+        [(dep.name, dep.version or "", dep.source_file_name) for dep in deps],
+    )
 
-    table = Table(title="Declared Dependencies (with latest versions)")
-    table.add_column("Package", style="cyan")
-    table.add_column("Declared Spec", style="green")
-    table.add_column("Latest Version", style="yellow")
-    table.add_column("Update Type", style="red")
-    table.add_column("Source File", style="magenta")
 
-    for dep in deps:
-        info = info_by_name.get(dep.name.lower())
-        table.add_row(
+def render_latest_file_table(
+    deps: List[DependencySpec],
+    info_by_key: Mapping[Tuple[str, str], VersionInfo],
+    outdated_only: bool = False,
+) -> None:
+    rows = [
+        (
             dep.name,
             dep.version or "",
-            info.latest if info else "",
-            info.update_type if info else UpdateType.NONE,
-            dep.source_file.name,
+            info.latest or "",
+            info.update_type,
+            dep.source_file_name,
         )
-
-    console.print(table)
+        for dep in deps
+        for info in (info_by_key.get(dep.join_key, EMPTY_INFO),)
+        # Unknown lookups fall back to EMPTY_INFO, so they are skipped as well.
+        if not outdated_only or info.update_type != UpdateType.NONE
+    ]
+    _emit_table(
+        "Declared Dependencies (with latest versions)",
+        [
+            ("Package", "cyan"),
+            ("Declared Spec", "green"),
+            ("Latest Version", "yellow"),
+            ("Update Type", "red"),
+            ("Source File", "magenta"),
+        ],
+        rows,
+    )
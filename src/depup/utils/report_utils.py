@@ -1,38 +1,43 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import List, Mapping, Tuple
 
-from depup.core.models import DependencySpec, VersionInfo, UpdateType
+from depup.core.models import EMPTY_INFO, DependencySpec, VersionInfo
+
+_ROW = "| %s | %s | %s | %s | %s |\n"
 
 
 def generate_markdown_report(
     output_path: Path,
     deps: List[DependencySpec],
-    infos: List[VersionInfo],
+    info_by_key: Mapping[Tuple[str, str], VersionInfo],
     title: str = "Dependency Report",
 ) -> None:
     """
     Generate a Markdown dependency report.
-    """
-
-    info_by_name = {i.name.lower(): i for i in infos}
-
-    lines: list[str] = []
-    lines.append(f"# {title}\n")
-    lines.append("| Package | Current | Latest | Update Type | Source |")
-    lines.append("|--------|---------|--------|-------------|--------|")
 
-    for dep in deps:
-        info = info_by_name.get(dep.name.lower())
-
-        current = dep.version or ""
-        latest = info.latest if info else ""
-        update_type = info.update_type if info else UpdateType.NONE
-        source = dep.source_file.name
-
-        lines.append(
-            f"| {dep.name} | {current} | {latest} | {update_type} | {source} |"
-        )
+    `info_by_key` maps each dependency's `join_key` to its VersionInfo.
+    """
 
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    # Rows go straight into one large write buffer: no list of lines and no
+    # joined copy of the whole report in memory.
+    with output_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(f"# {title}\n\n")
+        f.write("| Package | Current | Latest | Update Type | Source |\n")
+        f.write("|--------|---------|--------|-------------|--------|\n")
+
+        for dep in deps:
+            info = info_by_key.get(dep.join_key, EMPTY_INFO)
+
+            # .value: %s (and format() on 3.12+) would print "UpdateType.NONE".
+            f.write(
+                _ROW
+                % (
+                    dep.name,
+                    dep.version or "",
+                    info.latest or "",
+                    info.update_type.value,
+                    dep.source_file_name,
+                )
+            )
@@ -1,26 +1,75 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import json
+from typing import Any, Dict, Iterator, List, Mapping, TextIO, Tuple
 
-from depup.core.models import DependencySpec, UpdateType, VersionInfo
+from depup.core.models import EMPTY_INFO, DependencySpec, UpdateType, VersionInfo
+
+try:  # optional C serializer, installed with the "fast" extra
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
 
 
 def _has_outdated(infos: List[VersionInfo]) -> bool:
-    return any(i.update_type in {UpdateType.PATCH, UpdateType.MINOR, UpdateType.MAJOR, UpdateType.NONE} for i in infos)
+    return any(i.update_type is not UpdateType.NONE for i in infos)
+
+
+def _index_by_key(
+    infos: List[VersionInfo],
+) -> Dict[Tuple[str, str], VersionInfo]:
+    """
+    Map (normalized package name, declared spec) to its VersionInfo. Built once
+    per command and shared by the renderers, JSON output and Markdown report.
+    """
+    return {i.join_key: i for i in infos}
 
 
-def _convert_to_jsonable(deps: List[DependencySpec], infos: List[VersionInfo]) -> Dict[str, Any]:
-    info_by = {i.name.lower(): i for i in infos}
-    items = []
+def _iter_jsonable(
+    deps: List[DependencySpec],
+    info_by_key: Mapping[Tuple[str, str], VersionInfo],
+) -> Iterator[Dict[str, Any]]:
     for d in deps:
-        vi = info_by.get(d.name.lower())
-        items.append(
-            {
-                "name": d.name,
-                "declared": d.version,
-                "latest": vi.latest if vi else None,
-                "update_type": (vi.update_type.value if vi else UpdateType.NONE.value),
-                "source_file": (d.source_file.name if d.source_file else None),
-            }
-        )
-    return {"dependencies": items}
+        vi = info_by_key.get(d.join_key, EMPTY_INFO)
+        yield {
+            "name": d.name,
+            "declared": d.version,
+            "latest": vi.latest,
+            "update_type": vi.update_type.value,
+            "source_file": d.source_file_name or None,
+        }
+
+
+def _convert_to_jsonable(
+    deps: List[DependencySpec],
+    info_by_key: Mapping[Tuple[str, str], VersionInfo],
+) -> Dict[str, Any]:
+    return {"dependencies": list(_iter_jsonable(deps, info_by_key))}
+
+
+def _write_json(
+    out: TextIO,
+    deps: List[DependencySpec],
+    info_by_key: Mapping[Tuple[str, str], VersionInfo],
+) -> None:
+    """
+    Write the same compact document as `_dumps_json(_convert_to_jsonable(...))`
+    one dependency at a time, so neither the list of dicts nor the whole
+    serialized string is held in memory.
+    """
+    write = out.write
+    write('{"dependencies":[')
+    for i, item in enumerate(_iter_jsonable(deps, info_by_key)):
+        if i:
+            write(",")
+        write(_dumps_json(item))
+    write("]}\n")
+
+
+def _dumps_json(obj: Any) -> str:
+    """
+    Serialize to compact JSON, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
-from depup.core.models import VersionInfo
-from depup.core.parsers.declaration_parser import DependencySpec
+from depup.core.models import DependencySpec, VersionInfo
 from depup.core.upgrade_executor import PlannedUpgrade
 
 
@@ -15,11 +14,14 @@ def build_upgrade_plans(
 ) -> List[PlannedUpgrade]:
     plans: List[PlannedUpgrade] = []
 
+    # Each VersionInfo belongs to one declared spec; the first file declaring
+    # that spec wins, as with a linear search.
+    deps_by_key: Dict[Tuple[str, str], DependencySpec] = {}
+    for d in deps:
+        deps_by_key.setdefault(d.join_key, d)
+
     for info in infos:
-        dep_spec = next(
-            (d for d in deps if d.name.lower() == info.name.lower()),
-            None,
-        )
+        dep_spec = deps_by_key.get(info.join_key)
 
         source_file = (
             dep_spec.source_file if dep_spec else project_root / "requirements.txt"
@@ -1,9 +1,15 @@
 from __future__ import annotations
-from typing import Iterable, List, Optional, Set
-from depup.core.models import VersionInfo, UpdateType
-from rich.console import Console
 
-console = Console()
+from typing import FrozenSet, Iterable, List, Optional, Set
+
+from depup.core.models import UpdateType, VersionInfo
+from depup.utils.console import get_console
+
+# Shared result for the common no-flags case, built once at import.
+_ANY_UPDATE: FrozenSet[UpdateType] = frozenset(
+    {UpdateType.PATCH, UpdateType.MINOR, UpdateType.MAJOR}
+)
+
 
 def select_upgradable_versions(
     infos: Iterable[VersionInfo],
@@ -17,7 +23,7 @@ def select_upgradable_versions(
 
     Args:
         infos: Iterable of VersionInfo objects to filter.
-        pkg_filter: Optional set of package names (lowercase) to include.
+        pkg_filter: Optional set of normalized package names to include.
         only_patch: Include only patch-level updates.
         only_minor: Include only minor-level updates.
         only_major: Include only major-level updates.
@@ -32,24 +38,14 @@ def select_upgradable_versions(
         only_major=only_major,
     )
 
-    selected: List[VersionInfo] = []
-
-    for info in infos:
-        # Skip already up-to-date packages
-        if info.update_type == UpdateType.NONE:
-            continue
-
-        # Package filter (if provided)
-        if pkg_filter and info.name.lower() not in pkg_filter:
-            continue
-
-        # Update-type filter
-        if info.update_type not in allowed_update_types:
-            continue
-
-        selected.append(info)
-
-    return selected
+    # The allowed set never contains NONE, so one membership test also skips
+    # packages that are already up to date.
+    return [
+        info
+        for info in infos
+        if info.update_type in allowed_update_types
+        and (not pkg_filter or info.canonical_name in pkg_filter)
+    ]
 
 
 def _resolve_allowed_update_types(
@@ -57,7 +53,7 @@ def _resolve_allowed_update_types(
     only_patch: bool,
     only_minor: bool,
     only_major: bool,
-) -> Set[UpdateType]:
+) -> FrozenSet[UpdateType]:
     """
     Determine which update types are allowed based on CLI flags.
 
@@ -65,45 +61,70 @@ def _resolve_allowed_update_types(
     """
 
     if not (only_patch or only_minor or only_major):
-        return {
-            UpdateType.PATCH,
-            UpdateType.MINOR,
-            UpdateType.MAJOR,
-        }
+        return _ANY_UPDATE
+
+    return frozenset(
+        update_type
+        for update_type, wanted in (
+            (UpdateType.PATCH, only_patch),
+            (UpdateType.MINOR, only_minor),
+            (UpdateType.MAJOR, only_major),
+        )
+        if wanted
+    )
+
+
+def _perform_env_upgrades(infos: List[VersionInfo], dry_run: bool = False):
+    """
+    Upgrade environment packages with a single pip invocation.
+
+    pip resolves and downloads everything in one run; if that batch fails,
+    each package is retried on its own so one bad pin does not block the rest
+    and failures are reported per package.
+    """
+    import subprocess
 
-    allowed: Set[UpdateType] = set()
+    console = get_console()
+    if dry_run:
+        for info in infos:
+            console.print(f"[cyan]Would upgrade {info.name} → {info.latest}[/cyan]")
+        return
 
-    if only_patch:
-        allowed.add(UpdateType.PATCH)
-    if only_minor:
-        allowed.add(UpdateType.MINOR)
-    if only_major:
-        allowed.add(UpdateType.MAJOR)
+    for info in infos:
+        console.print(f"[blue]Upgrading {info.name} → {info.latest}...[/blue]")
+
+    try:
+        _pip_install([f"{info.name}=={info.latest}" for info in infos])
+    except subprocess.CalledProcessError as exc:
+        if len(infos) == 1:
+            console.print(f"[red]✗ Failed to upgrade {infos[0].name}: {exc}[/red]")
+            return
+
+        console.print(
+            "[yellow]Batch upgrade failed; retrying packages one by one.[/yellow]"
+        )
+        for info in infos:
+            try:
+                _pip_install([f"{info.name}=={info.latest}"])
+                console.print(f"[green]✓ {info.name} upgraded successfully[/green]")
+            except subprocess.CalledProcessError as exc:
+                console.print(f"[red]✗ Failed to upgrade {info.name}: {exc}[/red]")
+        return
 
-    return allowed
+    for info in infos:
+        console.print(f"[green]✓ {info.name} upgraded successfully[/green]")
 
 
-def _perform_env_upgrades(infos: List[VersionInfo], dry_run: bool = False):
+def _pip_install(specs: List[str]) -> None:
+    """
+    Install `specs` into the running interpreter's environment with the
+    installer chosen by depup.core.installer (uv or pip, see DEPUP_INSTALLER).
+    """
     import subprocess
 
-    for info in infos:
-        pkg = info.name
-        target = info.latest
-
-        if dry_run:
-            console.print(f"[cyan]Would upgrade {pkg} → {target}[/cyan]")
-            continue
-
-        console.print(f"[blue]Upgrading {pkg} → {target}...[/blue]")
-
-        try:
-            subprocess.run(
-                ["pip", "install", "-U", f"{pkg}=={target}"],
-                check=True,
-            )
-            console.print(f"[green]✓ {pkg} upgraded successfully[/green]")
-        except subprocess.CalledProcessError as exc:
-            console.print(f"[red]✗ Failed to upgrade {pkg}: {exc}[/red]")
+    from depup.core.installer import install_command
+
+    subprocess.run(install_command(specs), check=True)
 
 __all__ = [
     "_perform_env_upgrades",
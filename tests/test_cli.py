@@ -1,3 +1,4 @@
+import json
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
@@ -5,6 +6,7 @@ from unittest.mock import patch
 from typer.testing import CliRunner
 
 from depup.cli.main import app
+from depup.core.models import UpdateType
 from depup.core.version_scanner import VersionInfo
 
 runner = CliRunner()
@@ -26,7 +28,7 @@ def test_scan_lists_dependencies():
         assert "2.31.0" in result.stdout
 
 
-@patch("depup.cli.main.VersionScanner")
+@patch("depup.core.version_scanner.VersionScanner")
 def test_scan_with_latest_uses_version_scanner(mock_version_scanner) -> None:
     # Arrange fake VersionScanner.scan result
     instance = mock_version_scanner.return_value
@@ -50,3 +52,192 @@ def test_scan_with_latest_uses_version_scanner(mock_version_scanner) -> None:
     assert "requests" in result.stdout
     assert "2.31.0" in result.stdout
     assert "patch" in result.stdout
+
+
+def test_scan_json_output_is_plain_json_when_piped():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root / "requirements.txt", "requests==2.31.0\n")
+
+        result = runner.invoke(app, ["scan", "--json", str(root)])
+
+    assert result.exit_code == 0
+    data = json.loads(result.stdout)
+    assert data["dependencies"][0]["name"] == "requests"
+    assert data["dependencies"][0]["declared"] == "==2.31.0"
+
+
+def test_scan_prefers_poetry_lock_over_pyproject():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(
+            root / "pyproject.toml",
+            '[tool.poetry.dependencies]\npython = "^3.11"\nrequests = "^2.30"\n',
+        )
+        write(
+            root / "poetry.lock",
+            '[[package]]\nname = "requests"\nversion = "2.31.0"\n',
+        )
+
+        result = runner.invoke(app, ["scan", "--json", str(root)])
+
+    assert result.exit_code == 0
+    deps = json.loads(result.stdout)["dependencies"]
+    assert [(d["declared"], d["source_file"]) for d in deps] == [
+        ("==2.31.0", "poetry.lock")
+    ]
+
+
+@patch("depup.core.version_scanner.VersionScanner")
+def test_scan_check_exits_zero_when_up_to_date(mock_version_scanner) -> None:
+    instance = mock_version_scanner.return_value
+    instance.scan.return_value = [
+        VersionInfo(
+            name="requests",
+            current="==2.31.0",
+            latest="2.31.0",
+            update_type=UpdateType.NONE,
+        )
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root / "requirements.txt", "requests==2.31.0\n")
+
+        result = runner.invoke(app, ["scan", "--latest", "--check", str(root)])
+
+    assert result.exit_code == 0
+
+
+def test_scan_table_is_plain_text_when_piped():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root / "requirements.txt", "requests==2.31.0\n")
+
+        result = runner.invoke(app, ["scan", str(root)])
+
+    assert result.exit_code == 0
+    lines = result.stdout.splitlines()
+    assert lines[0] == "Declared Dependencies"
+    assert lines[-1].split() == ["requests", "==2.31.0", "requirements.txt"]
+    assert "│" not in result.stdout
+
+
+def test_scan_writes_markdown_report():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root / "requirements.txt", "requests==2.31.0\nnumpy>=1.25\n")
+        report = root / "report.md"
+
+        result = runner.invoke(app, ["scan", str(root), "--report", str(report)])
+
+        assert result.exit_code == 0
+        lines = report.read_text().splitlines()
+
+    assert lines[0] == "# Project Dependency Report"
+    assert lines[2] == "| Package | Current | Latest | Update Type | Source |"
+    assert lines[4] == "| requests | ==2.31.0 |  | none | requirements.txt |"
+    assert lines[5] == "| numpy | >=1.25 |  | none | requirements.txt |"
+    assert len(lines) == 6
+
+
+def test_env_upgrade_installs_with_uv_when_available():
+    from depup.utils.upgrade_utils import _perform_env_upgrades
+
+    infos = [
+        VersionInfo(
+            name="requests",
+            current="2.30.0",
+            latest="2.31.0",
+            update_type=UpdateType.MINOR,
+        )
+    ]
+
+    with patch.dict("os.environ", {"DEPUP_INSTALLER": "auto"}), patch(
+        "shutil.which", return_value="/usr/bin/uv"
+    ), patch("subprocess.run") as mock_run:
+        _perform_env_upgrades(infos)
+
+    args = mock_run.call_args.args[0]
+    assert args[:3] == ["/usr/bin/uv", "pip", "install"]
+    assert args[-1] == "requests==2.31.0"
+
+
+def test_env_upgrade_uses_pip_when_installer_is_pinned():
+    import sys
+
+    from depup.utils.upgrade_utils import _perform_env_upgrades
+
+    infos = [
+        VersionInfo(
+            name="requests",
+            current="2.30.0",
+            latest="2.31.0",
+            update_type=UpdateType.MINOR,
+        )
+    ]
+
+    with patch.dict("os.environ", {"DEPUP_INSTALLER": "pip"}), patch(
+        "shutil.which", return_value="/usr/bin/uv"
+    ), patch("subprocess.run") as mock_run:
+        _perform_env_upgrades(infos)
+
+    args = mock_run.call_args.args[0]
+    assert args[:4] == [sys.executable, "-m", "pip", "install"]
+
+
+@patch("depup.core.version_scanner.VersionScanner")
+def test_scan_outdated_only_hides_up_to_date_rows(mock_version_scanner) -> None:
+    mock_version_scanner.return_value.scan.return_value = [
+        VersionInfo(
+            name="requests",
+            current="==2.30.0",
+            latest="2.31.0",
+            update_type=UpdateType.PATCH,
+        ),
+        VersionInfo(
+            name="numpy",
+            current="==1.26.0",
+            latest="1.26.0",
+            update_type=UpdateType.NONE,
+        ),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root / "requirements.txt", "requests==2.30.0\nnumpy==1.26.0\n")
+
+        result = runner.invoke(app, ["scan", "--latest", "--outdated-only", str(root)])
+
+    assert result.exit_code == 0
+    assert "requests" in result.stdout
+    assert "numpy" not in result.stdout
+
+
+def test_streamed_json_matches_full_document():
+    import io
+
+    from depup.core.models import DependencySpec
+    from depup.utils.scan_utils import _convert_to_jsonable, _dumps_json, _write_json
+
+    deps = [
+        DependencySpec(
+            name="requests",
+            version="==2.30.0",
+            source_file=Path("requirements.txt"),
+        ),
+        DependencySpec(name="numpy", version=None, source_file=None),
+    ]
+    info_by_key = {
+        ("requests", "==2.30.0"): VersionInfo(
+            name="requests",
+            current="==2.30.0",
+            latest="2.31.0",
+            update_type=UpdateType.PATCH,
+        )
+    }
+
+    out = io.StringIO()
+    _write_json(out, deps, info_by_key)
+
+    assert out.getvalue() == _dumps_json(_convert_to_jsonable(deps, info_by_key)) + "\n"
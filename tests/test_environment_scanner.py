@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from depup.core.environment_scanner import EnvironmentScanner
+from depup.core.models import DependencySpec
+
+
+def _fake_scan():
+    return [DependencySpec(name="requests", version="2.31.0", source_file=None)]
+
+
+def test_environment_cache_is_reused_until_a_path_dir_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "cache"
+        target = Path(tmp) / "target"
+        target.mkdir()
+        scanner = EnvironmentScanner(cache_dir=cache_dir)
+
+        with patch.object(sys, "path", [*sys.path, str(target)]), patch.object(
+            EnvironmentScanner, "_scan_distributions", side_effect=_fake_scan
+        ) as mock_scan:
+            first = scanner.scan()
+            second = scanner.scan()
+            assert mock_scan.call_count == 1
+            assert [d.name for d in second] == [d.name for d in first]
+
+            # A distribution appearing in a non-site dir (pip install --target)
+            mtime = target.stat().st_mtime_ns + 1_000_000_000
+            os.utime(target, ns=(mtime, mtime))
+            scanner.scan()
+            assert mock_scan.call_count == 2
+
+
+def test_environment_cache_is_keyed_by_search_path():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "cache"
+        extra = Path(tmp) / "extra"
+        extra.mkdir()
+        scanner = EnvironmentScanner(cache_dir=cache_dir)
+
+        with patch.object(
+            EnvironmentScanner, "_scan_distributions", side_effect=_fake_scan
+        ) as mock_scan:
+            scanner.scan()
+            with patch.object(sys, "path", [str(extra), *sys.path]):
+                scanner.scan()
+
+        assert mock_scan.call_count == 2
+        assert len(list(cache_dir.glob("env-*.json"))) == 2
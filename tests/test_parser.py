@@ -23,6 +23,51 @@ def test_parse_requirements():
         assert deps[1].version == ">=1.20"
 
 
+def test_parse_requirements_skips_comments_and_unsupported_lines():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        req = root / "requirements.txt"
+        write(
+            req,
+            "# pinned\n"
+            "requests==2.31.0  # security fix\n"
+            "\n"
+            "-r other.txt\n"
+            "zope.interface\n",
+        )
+
+        deps = DependencyParser(root).parse_all()
+
+        assert [(d.name, d.version) for d in deps] == [
+            ("requests", "==2.31.0"),
+            ("zope.interface", None),
+        ]
+
+
+def test_parse_requirements_skips_local_paths_and_options():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(
+            root / "requirements.txt",
+            ".\n..\n--pre\n--no-index\nrequests==2.31.0\n",
+        )
+
+        deps = DependencyParser(root).parse_all()
+
+        assert [(d.name, d.version) for d in deps] == [("requests", "==2.31.0")]
+
+
+def test_parse_requirements_normalizes_join_key_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root / "requirements.txt", "Typing_Extensions>=4.0\n")
+
+        dep = DependencyParser(root).parse_all()[0]
+
+        assert dep.name == "Typing_Extensions"
+        assert dep.canonical_name == "typing-extensions"
+
+
 def test_parse_pyproject_pep621():
     with tempfile.TemporaryDirectory() as tmp:
         root = Path(tmp)
@@ -45,6 +90,30 @@ dependencies = [
         assert deps[0].version == ">=2.0"
 
 
+def test_parse_pyproject_pep621_extras_and_markers():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(
+            root / "pyproject.toml",
+            """
+[project]
+dependencies = [
+    "requests[socks]>=2.0",
+    "zope.interface==6.0",
+    "tomli>=1.1; python_version < '3.11'",
+]
+""",
+        )
+
+        deps = DependencyParser(root).parse_all()
+
+        assert [(d.name, d.version) for d in deps] == [
+            ("requests", ">=2.0"),
+            ("zope.interface", "==6.0"),
+            ("tomli", ">=1.1"),
+        ]
+
+
 def test_parse_pipfile():
     with tempfile.TemporaryDirectory() as tmp:
         root = Path(tmp)
@@ -1,9 +1,9 @@
-from pathlib import Path
 import tempfile
+from pathlib import Path
 from unittest.mock import patch
 
-from depup.core.upgrade_executor import UpgradeExecutor, PlannedUpgrade
 from depup.core.parsers.declaration_parser import DependencySpec
+from depup.core.upgrade_executor import PlannedUpgrade, UpgradeExecutor
 
 
 def test_update_pyproject_pep621_dependencies():
@@ -119,3 +119,280 @@ pytest = ">=7.0.0"
         assert 'requests = ">=2.30.0"' not in content
         # wildcard remains unchanged
         assert 'numpy = "*"' in content
+
+
+def test_update_requirements_entry_matches_whole_name():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        req = root / "requirements.txt"
+        req.write_text(
+            "Requests==2.30.0  # pinned\n"
+            "requests-oauthlib==1.3.0\n"
+            "numpy>=1.25\n"
+        )
+
+        deps = [DependencySpec(name="Requests", version="==2.30.0", source_file=req)]
+        plan = PlannedUpgrade(
+            name="Requests",
+            current_spec="==2.30.0",
+            target_version="2.31.0",
+            source_file=req,
+        )
+
+        executor = UpgradeExecutor(project_root=root, dependencies=deps)
+
+        with patch("depup.core.upgrade_executor.subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            executor.execute([plan], dry_run=False)
+
+        assert req.read_text() == (
+            "Requests==2.31.0  # pinned\n"
+            "requests-oauthlib==1.3.0\n"
+            "numpy>=1.25\n"
+        )
+
+
+def test_execute_rewrites_each_file_once_for_all_plans():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        req = root / "requirements.txt"
+        req.write_text("requests==2.30.0\nnumpy==1.25.0\nflask==3.0.0\n")
+
+        deps = [
+            DependencySpec(name="requests", version="==2.30.0", source_file=req),
+            DependencySpec(name="numpy", version="==1.25.0", source_file=req),
+        ]
+        plans = [
+            PlannedUpgrade("requests", "==2.30.0", "2.31.0", req),
+            PlannedUpgrade("numpy", "==1.25.0", "1.26.0", req),
+        ]
+
+        executor = UpgradeExecutor(project_root=root, dependencies=deps)
+
+        with patch("depup.core.upgrade_executor.subprocess.run"), patch.object(
+            Path, "write_text", autospec=True, side_effect=Path.write_text
+        ) as mock_write:
+            executor.execute(plans, dry_run=False)
+
+        writes = [call.args[0] for call in mock_write.call_args_list]
+        assert writes.count(req) == 1
+        assert req.read_text() == "requests==2.31.0\nnumpy==1.26.0\nflask==3.0.0\n"
+
+
+def test_update_pyproject_preserves_formatting():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        py = root / "pyproject.toml"
+        original = (
+            "[project]\n"
+            'name = "example"  # keep me\n'
+            "dependencies = [\n"
+            "    'requests>=2.30.0',  # http\n"
+            '    "numpy==1.25.0",\n'
+            "]\n"
+            "\n"
+            "[tool.poetry.dependencies]\n"
+            'python = "^3.11"\n'
+            'flask   =   ">=2.0"\n'
+        )
+        py.write_text(original)
+
+        deps = [
+            DependencySpec(name="requests", version=">=2.30.0", source_file=py),
+            DependencySpec(name="flask", version=">=2.0", source_file=py),
+        ]
+        plans = [
+            PlannedUpgrade("requests", ">=2.30.0", "2.31.0", py),
+            PlannedUpgrade("flask", ">=2.0", "3.0.0", py),
+        ]
+
+        executor = UpgradeExecutor(project_root=root, dependencies=deps)
+
+        with patch("depup.core.upgrade_executor.subprocess.run"):
+            executor.execute(plans, dry_run=False)
+
+        assert py.read_text() == (
+            original.replace("'requests>=2.30.0'", "'requests>=2.31.0'")
+            .replace('">=2.0"', '">=3.0.0"')
+        )
+
+
+def test_execute_installs_all_plans_with_one_pip_run():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        req = root / "requirements.txt"
+        plans = [
+            PlannedUpgrade("requests", "==2.30.0", "2.31.0", req),
+            PlannedUpgrade("numpy", "==1.25.0", "1.26.0", req),
+        ]
+
+        with patch("depup.core.upgrade_executor.subprocess.run") as mock_run:
+            UpgradeExecutor(project_root=root, dependencies=[]).execute(plans)
+
+        assert mock_run.call_count == 1
+        args = mock_run.call_args.args[0]
+        assert args[-2:] == ["requests==2.31.0", "numpy==1.26.0"]
+
+
+def test_execute_retries_one_by_one_after_batch_failure():
+    import subprocess
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        req = root / "requirements.txt"
+        plans = [
+            PlannedUpgrade("requests", "==2.30.0", "2.31.0", req),
+            PlannedUpgrade("numpy", "==1.25.0", "9.9.9", req),
+        ]
+
+        def fake_run(args, **kwargs):
+            if "numpy==9.9.9" in args:
+                raise subprocess.CalledProcessError(1, args, stderr="no such version")
+
+        with patch(
+            "depup.core.upgrade_executor.subprocess.run", side_effect=fake_run
+        ) as mock_run:
+            executor = UpgradeExecutor(project_root=root, dependencies=[])
+            errors = executor._run_pip_upgrades(plans)
+
+        assert mock_run.call_count == 3
+        assert list(errors) == ["numpy"]
+
+
+def test_update_requirements_leaves_unpinned_file_untouched():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        req = root / "requirements.txt"
+        req.write_text("requests\nnumpy==1.25.0")
+
+        deps = [DependencySpec(name="requests", version=None, source_file=req)]
+        plan = PlannedUpgrade("requests", None, "2.31.0", req)
+
+        with patch("depup.core.upgrade_executor.subprocess.run"):
+            UpgradeExecutor(project_root=root, dependencies=deps).execute([plan])
+
+        assert req.read_text() == "requests\nnumpy==1.25.0"
+        assert not (root / "requirements.txt.depup.bak").exists()
+
+
+def test_update_dependency_files_skips_missing_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        req = root / "requirements.txt"
+
+        deps = [DependencySpec(name="requests", version="==2.30.0", source_file=req)]
+        executor = UpgradeExecutor(project_root=root, dependencies=deps)
+
+        errors = executor._update_dependency_files(
+            [PlannedUpgrade("requests", "==2.30.0", "2.31.0", req)]
+        )
+
+        assert errors == {}
+        assert not req.exists()
+
+
+def test_backup_keeps_original_bytes():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        req = root / "requirements.txt"
+        req.write_bytes(b"requests==2.30.0\r\n# caf\xc3\xa9\r\n")
+
+        deps = [DependencySpec(name="requests", version="==2.30.0", source_file=req)]
+        executor = UpgradeExecutor(project_root=root, dependencies=deps)
+        executor._update_requirements_entries(req, {"requests": "2.31.0"})
+
+        backup = root / "requirements.txt.depup.bak"
+        assert backup.read_bytes() == b"requests==2.30.0\r\n# caf\xc3\xa9\r\n"
+
+
+def test_execute_returns_result_per_plan():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        req = root / "requirements.txt"
+        plans = [
+            PlannedUpgrade("requests", "==2.30.0", "2.31.0", req),
+            PlannedUpgrade("numpy", "==1.25.0", "1.26.0", req),
+        ]
+
+        results = UpgradeExecutor(project_root=root, dependencies=[]).execute(
+            plans, dry_run=True
+        )
+
+        assert [r.name for r in results] == ["requests", "numpy"]
+        assert all(r.success and r.dry_run for r in results)
+
+
+def _pyproject_with(tmp: str, *entries: str) -> Path:
+    py = Path(tmp) / "pyproject.toml"
+    py.write_text(
+        "[project]\nname = \"example\"\ndependencies = [\n"
+        + "".join(f'  "{e}",\n' for e in entries)
+        + "]\n"
+    )
+    return py
+
+
+def test_update_pyproject_keeps_environment_marker():
+    with tempfile.TemporaryDirectory() as tmp:
+        py = _pyproject_with(tmp, "foo>=1.0; python_version<'3.9'")
+        deps = [DependencySpec(name="foo", version=">=1.0", source_file=py)]
+        plan = PlannedUpgrade("foo", ">=1.0", "2.0.0", py)
+
+        with patch("depup.core.upgrade_executor.subprocess.run"):
+            results = UpgradeExecutor(Path(tmp), deps).execute([plan])
+
+        assert "\"foo>=2.0.0; python_version<'3.9'\"" in py.read_text()
+        assert results[0].success
+
+
+def test_update_pyproject_keeps_extras():
+    with tempfile.TemporaryDirectory() as tmp:
+        py = _pyproject_with(tmp, "bar[extra] >= 1.0", "baz==1.0")
+        deps = [
+            DependencySpec(name="bar", version=">= 1.0", source_file=py),
+            DependencySpec(name="baz", version="==1.0", source_file=py),
+        ]
+        plans = [
+            PlannedUpgrade("bar", ">= 1.0", "1.5.0", py),
+            PlannedUpgrade("baz", "==1.0", "1.1", py),
+        ]
+
+        with patch("depup.core.upgrade_executor.subprocess.run"):
+            results = UpgradeExecutor(Path(tmp), deps).execute(plans)
+
+        content = py.read_text()
+        assert '"bar[extra] >= 1.5.0"' in content
+        assert '"baz==1.1"' in content
+        assert all(r.success for r in results)
+
+
+def test_update_pyproject_reports_unrewritable_specifier():
+    with tempfile.TemporaryDirectory() as tmp:
+        py = _pyproject_with(tmp, "attrs>=21,<24")
+        original = py.read_text()
+        deps = [DependencySpec(name="attrs", version=">=21,<24", source_file=py)]
+        plan = PlannedUpgrade("attrs", ">=21,<24", "25.1.0", py)
+
+        with patch("depup.core.upgrade_executor.subprocess.run"):
+            results = UpgradeExecutor(Path(tmp), deps).execute([plan])
+
+        assert py.read_text() == original
+        assert not results[0].success
+        assert "attrs" in results[0].error
+
+
+def test_execute_installs_with_the_same_installer_as_env_mode():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        plan = PlannedUpgrade(
+            "requests", "==2.30.0", "2.31.0", root / "requirements.txt"
+        )
+
+        with patch.dict("os.environ", {"DEPUP_INSTALLER": "auto"}), patch(
+            "shutil.which", return_value="/usr/bin/uv"
+        ), patch("depup.core.upgrade_executor.subprocess.run") as mock_run:
+            UpgradeExecutor(project_root=root, dependencies=[]).execute([plan])
+
+        args = mock_run.call_args.args[0]
+        assert args[:3] == ["/usr/bin/uv", "pip", "install"]
+        assert args[-1] == "requests==2.31.0"
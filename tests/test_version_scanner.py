@@ -1,19 +1,25 @@
-from unittest.mock import patch, Mock
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
 
+import pytest
+
+from depup.core.cache import PyPICache
 from depup.core.models import DependencySpec, UpdateType
-from depup.core.version_scanner import VersionScanner
+from depup.core.version_scanner import VersionScanner, VersionScannerError
 
 
 def mock_pypi(version: str):
     resp = Mock()
     resp.status_code = 200
-    resp.json.return_value = {"info": {"version": version}}
+    resp.headers = {"Content-Type": VersionScanner.SIMPLE_ACCEPT}
+    resp.content = json.dumps({"versions": [version], "files": []}).encode()
     return resp
 
 
-@patch("depup.core.version_scanner.requests.get")
-def test_version_scanner_minor(mock_get):
-    mock_get.return_value = mock_pypi("2.30.0")
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_minor(mock_session):
+    mock_session.return_value.get.return_value = mock_pypi("2.30.0")
 
     dep = DependencySpec("requests", "==2.29.0", None)
     result = VersionScanner().scan([dep])[0]
@@ -22,9 +28,9 @@ def test_version_scanner_minor(mock_get):
     assert result.update_type == UpdateType.MINOR
 
 
-@patch("depup.core.version_scanner.requests.get")
-def test_version_scanner_patch(mock_get):
-    mock_get.return_value = mock_pypi("1.5.3")
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_patch(mock_session):
+    mock_session.return_value.get.return_value = mock_pypi("1.5.3")
 
     dep = DependencySpec("pandas", "==1.5.2", None)
     result = VersionScanner().scan([dep])[0]
@@ -32,11 +38,168 @@ def test_version_scanner_patch(mock_get):
     assert result.update_type == UpdateType.PATCH
 
 
-@patch("depup.core.version_scanner.requests.get")
-def test_version_scanner_major(mock_get):
-    mock_get.return_value = mock_pypi("2.0.0")
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_major(mock_session):
+    mock_session.return_value.get.return_value = mock_pypi("2.0.0")
 
     dep = DependencySpec("numpy", "==1.26.0", None)
     result = VersionScanner().scan([dep])[0]
 
     assert result.update_type == UpdateType.MAJOR
+
+
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_revalidates_cached_entry(mock_session, tmp_path):
+    fresh = mock_pypi("2.0.0")
+    fresh.headers["ETag"] = '"abc"'
+    not_modified = Mock()
+    not_modified.status_code = 304
+    mock_session.return_value.get.side_effect = [fresh, not_modified]
+
+    cache = PyPICache(tmp_path, max_age=0)
+    dep = DependencySpec("numpy", "==1.26.0", None)
+    VersionScanner(cache=cache).scan([dep])
+    result = VersionScanner(cache=cache).scan([dep])[0]
+
+    _, kwargs = mock_session.return_value.get.call_args
+    assert kwargs["headers"]["If-None-Match"] == '"abc"'
+    assert result.latest == "2.0.0"
+    assert result.update_type == UpdateType.MAJOR
+
+
+def test_latest_from_simple_skips_prereleases_and_yanked():
+    data = {
+        "versions": ["1.9.0", "2.0.0", "2.1.0", "3.0.0rc1"],
+        "files": [
+            {"filename": "pkg-2.0.0.tar.gz", "yanked": False},
+            {"filename": "pkg-2.1.0-py3-none-any.whl", "yanked": "broken"},
+            {"filename": "pkg-3.0.0rc1.tar.gz", "yanked": False},
+        ],
+    }
+    assert VersionScanner()._latest_from_simple(data) == "2.0.0"
+
+
+def test_latest_from_simple_compares_plain_and_post_releases():
+    scanner = VersionScanner()
+    assert scanner._latest_from_simple(
+        {"versions": ["1.9.0", "1.10.0", "1.10.0.post1", "2.0.0b1"], "files": []}
+    ) == "1.10.0.post1"
+    assert scanner._latest_from_simple(
+        {"versions": ["0.9", "1.0a1", "1.0b2"], "files": []}
+    ) == "0.9"
+    assert scanner._latest_from_simple(
+        {"versions": ["1.0a1", "1.0b2"], "files": []}
+    ) == "1.0b2"
+
+
+def test_latest_from_simple_requires_versions_list():
+    assert VersionScanner()._latest_from_simple({"files": []}) is None
+
+
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_wraps_network_errors(mock_session):
+    mock_session.return_value.get.side_effect = ConnectionError("boom")
+
+    deps = [DependencySpec(f"pkg{i}", "==1.0.0", None) for i in range(3)]
+    with pytest.raises(VersionScannerError):
+        VersionScanner().scan(deps)
+
+
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_trusts_fresh_cache_entry(mock_session, tmp_path):
+    mock_session.return_value.get.return_value = mock_pypi("2.0.0")
+
+    cache = PyPICache(tmp_path)
+    dep = DependencySpec("numpy", "==1.26.0", None)
+    VersionScanner(cache=cache).scan([dep])
+    result = VersionScanner(cache=cache).scan([dep])[0]
+
+    assert mock_session.return_value.get.call_count == 1
+    assert result.latest == "2.0.0"
+
+
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_persists_cache_index(mock_session, tmp_path):
+    mock_session.return_value.get.return_value = mock_pypi("2.0.0")
+
+    deps = [DependencySpec(name, "==1.0.0", None) for name in ("numpy", "pandas")]
+    VersionScanner(cache=PyPICache(tmp_path)).scan(deps)
+
+    assert [p.name for p in tmp_path.iterdir()] == [PyPICache.INDEX_NAME]
+    assert PyPICache(tmp_path).get("pandas").latest == "2.0.0"
+
+
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_looks_up_duplicate_packages_once(mock_session):
+    mock_session.return_value.get.return_value = mock_pypi("2.31.0")
+
+    deps = [
+        DependencySpec("requests", "==2.30.0", None),
+        DependencySpec("Requests", ">=2.0", None),
+    ]
+    results = VersionScanner().scan(deps)
+
+    assert mock_session.return_value.get.call_count == 1
+    assert [r.current for r in results] == ["==2.30.0", ">=2.0"]
+
+
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_classifies_each_pin_of_a_duplicate(mock_session):
+    mock_session.return_value.get.return_value = mock_pypi("2.31.0")
+
+    deps = [
+        DependencySpec("requests", "==2.31.0", Path("requirements.txt")),
+        DependencySpec("requests", "==1.2.0", Path("requirements-dev.txt")),
+    ]
+    results = VersionScanner().scan(deps)
+
+    assert mock_session.return_value.get.call_count == 1
+    by_spec = {r.current: r.update_type for r in results}
+    assert by_spec == {"==2.31.0": UpdateType.NONE, "==1.2.0": UpdateType.MAJOR}
+
+
+@patch("depup.core.version_scanner.requests.Session")
+def test_version_scanner_falls_back_to_json_api_on_406(mock_session):
+    refused = Mock(status_code=406, headers={"ETag": '"simple"'})
+    json_api = Mock(status_code=200, headers={"Content-Type": "application/json"})
+    json_api.content = json.dumps({"info": {"version": "3.1.0"}}).encode()
+    mock_session.return_value.get.side_effect = [refused, json_api]
+
+    dep = DependencySpec("flask", "==3.0.0", None)
+    result = VersionScanner().scan([dep])[0]
+
+    assert result.latest == "3.1.0"
+    assert result.update_type == UpdateType.MINOR
+
+
+def test_latest_from_json_api_reads_info_version_without_decoding():
+    body = {
+        "info": {
+            "description": 'He said "version": "0.0.1"',
+            "project_urls": {"Docs": "https://example.org"},
+            "requires_python": ">=3.8",
+            "version": "2.4.1",
+        },
+        "releases": {"2.4.1": [{"python_version": "py3"}]},
+    }
+    response = Mock(status_code=200)
+    response.content = json.dumps(body, separators=(",", ":")).encode()
+
+    scanner = VersionScanner()
+    with patch.object(scanner, "_get", return_value=response), patch.object(
+        VersionScanner, "_decode", side_effect=AssertionError("decoded")
+    ):
+        assert scanner._latest_from_json_api("pkg") == "2.4.1"
+
+
+def test_latest_from_json_api_fast_path_accepts_pretty_printed_body():
+    response = Mock(status_code=200)
+    response.content = json.dumps(
+        {"info": {"version": "1.2.0"}, "releases": {}}, indent=2
+    ).encode()
+
+    scanner = VersionScanner()
+    with patch.object(scanner, "_get", return_value=response), patch.object(
+        VersionScanner, "_decode", side_effect=AssertionError("decoded")
+    ):
+        assert scanner._latest_from_json_api("pkg") == "1.2.0"
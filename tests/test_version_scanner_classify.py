@@ -17,3 +17,19 @@ def test_classify_major_minor_patch():
 def test_classify_invalid_versions_unknown():
     vs = VersionScanner()
     assert vs._classify("==2004d", "1.0.0") == UpdateType.NONE
+
+
+def test_classify_non_simple_versions_fall_back_to_packaging():
+    vs = VersionScanner()
+    assert vs._classify(">=1.2", "1.3.0") == UpdateType.MINOR
+    assert vs._classify("==1.2.3rc1", "1.2.3") == UpdateType.PATCH
+    assert vs._classify("==2.0.0", "1.9.9") == UpdateType.NONE
+
+
+def test_normalize_declared_strips_leading_operator():
+    vs = VersionScanner()
+    assert vs._normalize_declared(">= 1.2") == "1.2"
+    assert vs._normalize_declared("~=2.0") == "2.0"
+    assert vs._normalize_declared("<3") == "3"
+    assert vs._normalize_declared("1.0.0") == "1.0.0"
+    assert vs._normalize_declared("  ") is None